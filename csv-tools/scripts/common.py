@@ -8,13 +8,34 @@ from __future__ import annotations
 
 import csv
 import io
+import json
+import os
+import re
+import stat
 import sys
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator, Sequence
 
 # Default encoding for CSV files.
 DEFAULT_ENCODING = "utf-8"
 
+# Plain decimal/exponent numbers; matches a subset of what float() accepts (see sniff_type).
+_NUM_RE = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?\Z")
+_FLOAT_SPECIAL_START = "nNiI"
+
+# Rows buffered from the top of the file to auto-detect the header (stable column count).
+HEADER_SNIFF_ROWS = 1000
+
+# Rows parsed per batch when building column lists in load_columns.
+COLUMN_BATCH_ROWS = 65536
+
+# Rows formatted in memory per write to the output stream.
+WRITE_BATCH_ROWS = 8192
+
+# Encoder chunks joined per write when streaming indented JSON.
+JSON_WRITE_BATCH_CHUNKS = 65536
+
 
 def read_text(path: str | None, encoding: str = DEFAULT_ENCODING) -> str:
     """Read file or stdin as text."""
@@ -23,6 +44,24 @@ def read_text(path: str | None, encoding: str = DEFAULT_ENCODING) -> str:
     return Path(path).read_text(encoding=encoding)
 
 
+def read_input(path: str | None, encoding: str = DEFAULT_ENCODING) -> tuple[str | None, int]:
+    """
+    Size of the input in bytes, plus its text when it can only be read once. A regular file gives
+    (None, its size) and callers stream it from path, as often as they need; stdin, pipes and process
+    substitutions are read whole and give (text, number of bytes read).
+    """
+    if not path or path == "-":
+        raw = sys.stdin.buffer.read()
+    else:
+        with open(path, "rb") as handle:
+            # The filesystem size is only meaningful for a regular file; a pipe or /dev/stdin reports 0.
+            info = os.fstat(handle.fileno())
+            if stat.S_ISREG(info.st_mode):
+                return None, info.st_size
+            raw = handle.read()
+    return raw.decode(encoding), len(raw)
+
+
 def _lines_filter_comment(lines: list[str], comment_char: str | None) -> list[str]:
     """Drop lines that start with comment_char (after strip)."""
     if not comment_char:
@@ -67,7 +106,43 @@ def _find_header_row(rows_list: list[list[str]], min_same_count: int = 2) -> int
     return 0
 
 
-def load_csv(
+def _iter_lines(
+    path: str | None,
+    encoding: str = DEFAULT_ENCODING,
+    comment_char: str | None = None,
+    skip_lines: int | None = None,
+    text_override: str | None = None,
+) -> Iterator[str]:
+    """
+    Yield input lines one at a time (universal newlines), without reading the whole file up front.
+    Strips a leading UTF-8 BOM, drops comment lines and leading blank lines, then skips skip_lines lines.
+    """
+    if text_override is not None:
+        stream: Any = io.StringIO(text_override, newline=None)
+    elif not path or path == "-":
+        stream = sys.stdin
+    else:
+        stream = open(path, encoding=encoding)
+    try:
+        lines: Iterator[str] = iter(stream)
+        for line in lines:
+            # Strip UTF-8 BOM so it does not become a column name or break header detection.
+            lines = chain((line[1:] if line.startswith("\ufeff") else line,), lines)
+            break
+        if comment_char:
+            lines = (line for line in lines if not line.strip().startswith(comment_char))
+        for line in lines:
+            if line.strip():
+                # Past the leading blank lines, the rest of the stream is handed through as-is, so
+                # without comment filtering no per-line Python code runs for the body of the file.
+                yield from islice(chain((line,), lines), skip_lines or 0, None)
+                break
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def iter_csv(
     path: str | None,
     delimiter: str = ",",
     has_header: bool = True,
@@ -75,93 +150,217 @@ def load_csv(
     encoding: str = DEFAULT_ENCODING,
     text_override: str | None = None,
     skip_lines: int | None = None,
-) -> tuple[list[str], list[dict[str, str]], int]:
+    limit: int | None = None,
+) -> tuple[list[str], Iterator[list[str]], int]:
     """
-    Load CSV and return (columns, data_rows, header_row).
+    Stream CSV and return (header, data_rows, header_row) where data_rows is an iterator of positional rows.
     header_row is 1-based index of the header in the parsed rows (1 = first row); 0 when has_header is False.
-    Only rows with the same number of columns as the header are included (footers/comments excluded).
+    Only rows with the same number of columns as the header are yielded (footers/comments excluded).
     Lines that start with comment_char are skipped before parsing.
     If text_override is provided, use it instead of reading from path.
     If skip_lines is set, that many lines are dropped after blank/comment handling; the next line is the header.
     Otherwise, when has_header is True, the header is the first row that has the "stable" column count
     (the count that appears most often among non-blank rows, at least 2 rows), so descriptive preamble
-    lines (single-column or different column count) are skipped automatically.
-    """
-    text = text_override if text_override is not None else read_text(path, encoding)
-    # Strip UTF-8 BOM so it does not become a column name or break header detection.
-    if text.startswith("\ufeff"):
-        text = text[1:]
-    lines = text.splitlines()
-    if not lines:
-        return ([], [], 0)
-
-    lines = _lines_filter_comment(lines, comment_char)
-    if not lines:
-        return ([], [], 0)
-
-    # Drop leading blank lines (empty or whitespace-only).
-    while lines and not lines[0].strip():
-        lines = lines[1:]
-    if not lines:
-        return ([], [], 0)
-
-    # Optional: skip a fixed number of preamble lines (then first parsed row = header).
-    if skip_lines is not None and skip_lines > 0:
-        lines = lines[skip_lines:]
-    if not lines:
-        return ([], [], 0)
-
-    reader = csv.reader(io.StringIO("\n".join(lines)), delimiter=delimiter)
-    rows_list: list[list[str]] = list(reader)
-    if not rows_list:
-        return ([], [], 0)
+    lines (single-column or different column count) are skipped automatically. Only the first
+    HEADER_SNIFF_ROWS rows are buffered for this; the rest of the file is parsed as it is consumed.
+    If limit is set, at most that many data rows are yielded and reading stops there.
+    """
+    reader = csv.reader(_iter_lines(path, encoding, comment_char, skip_lines, text_override), delimiter=delimiter)
 
     # Skip any leading blank rows that still made it through (e.g. BOM-only row).
-    while rows_list and _is_blank_row(rows_list[0]):
-        rows_list = rows_list[1:]
-    if not rows_list:
-        return ([], [], 0)
+    for row in reader:
+        if not _is_blank_row(row):
+            buffered = [row]
+            break
+    else:
+        return ([], iter(()), 0)
 
     header_row_1based: int
     if has_header:
         if skip_lines is not None and skip_lines > 0:
-            header = rows_list[0]
-            data_rows_raw = rows_list[1:]
-            header_row_1based = 1
+            header_idx = 0
         else:
-            header_idx = _find_header_row(rows_list)
-            header = rows_list[header_idx]
-            data_rows_raw = rows_list[header_idx + 1 :]
-            header_row_1based = header_idx + 1
+            buffered.extend(islice(reader, HEADER_SNIFF_ROWS - 1))
+            header_idx = _find_header_row(buffered)
+        header = buffered[header_idx]
+        data_rows_raw = chain(buffered[header_idx + 1 :], reader)
+        header_row_1based = header_idx + 1
     else:
-        ncols = len(rows_list[0]) if rows_list else 0
+        ncols = len(buffered[0])
         header = [f"col{i}" for i in range(ncols)]
-        data_rows_raw = rows_list
+        data_rows_raw = chain(buffered, reader)
         header_row_1based = 0
 
     expected_len = len(header)
-    data_rows_raw = [r for r in data_rows_raw if len(r) == expected_len]
+    data_rows: Iterator[list[str]] = (r for r in data_rows_raw if len(r) == expected_len)
+    if limit is not None:
+        data_rows = islice(data_rows, max(0, limit))
+
+    return (header, data_rows, header_row_1based)
+
 
+def load_csv(
+    path: str | None,
+    delimiter: str = ",",
+    has_header: bool = True,
+    comment_char: str | None = None,
+    encoding: str = DEFAULT_ENCODING,
+    text_override: str | None = None,
+    skip_lines: int | None = None,
+) -> tuple[list[str], list[dict[str, str]], int]:
+    """
+    Load CSV and return (columns, data_rows, header_row) with one dict per data row.
+    See iter_csv for header detection and footer/comment handling.
+    """
+    header, data_rows, header_row_1based = iter_csv(
+        path, delimiter, has_header, comment_char, encoding, text_override, skip_lines
+    )
     rows: list[dict[str, str]] = []
-    for r in data_rows_raw:
+    for r in data_rows:
         rows.append(dict(zip(header, r)))
 
     return (header, rows, header_row_1based)
 
 
+def load_columns(
+    path: str | None,
+    delimiter: str = ",",
+    has_header: bool = True,
+    comment_char: str | None = None,
+    encoding: str = DEFAULT_ENCODING,
+    text_override: str | None = None,
+    skip_lines: int | None = None,
+) -> tuple[list[str], dict[str, list[str]], int]:
+    """
+    Load CSV column-wise and return (columns, col_data, header_row).
+    col_data maps each column name to the list of its cell values (one list per column instead of one
+    dict per row). Duplicate column names keep the last column, matching load_csv's row dicts.
+    Repeated values within a column are interned, so low-cardinality columns hold one str per distinct value.
+    See iter_csv for header detection and footer/comment handling.
+    """
+    header, data_rows, header_row_1based = iter_csv(
+        path, delimiter, has_header, comment_char, encoding, text_override, skip_lines
+    )
+    col_lists: list[list[str]] = [[] for _ in header]
+    # Per-column cache so repeated cells (categorical columns) share one str object; None once a
+    # column turns out to be mostly unique, where the cache would only cost memory.
+    caches: list[dict[str, str] | None] = [{} for _ in header]
+    rows_seen = 0
+    while True:
+        # Transpose a batch of rows at a time with zip(*batch) (C loop), so the full row list never exists.
+        batch = list(islice(data_rows, COLUMN_BATCH_ROWS))
+        if not batch:
+            break
+        rows_seen += len(batch)
+        for i, (values, batch_values) in enumerate(zip(col_lists, zip(*batch))):
+            cache = caches[i]
+            if cache is None:
+                values.extend(batch_values)
+                continue
+            values.extend(map(cache.setdefault, batch_values, batch_values))
+            if len(cache) > rows_seen // 2:
+                caches[i] = None
+    col_data = dict(zip(header, col_lists))
+
+    return (header, col_data, header_row_1based)
+
+
+def iter_column_batches(
+    path: str | None,
+    delimiter: str = ",",
+    has_header: bool = True,
+    comment_char: str | None = None,
+    encoding: str = DEFAULT_ENCODING,
+    text_override: str | None = None,
+    skip_lines: int | None = None,
+    batch_rows: int = COLUMN_BATCH_ROWS,
+) -> tuple[list[str], Iterator[dict[str, list[str]]], int]:
+    """
+    Stream CSV column-wise and return (columns, batches, header_row).
+    Each batch is a col_data mapping (as in load_columns) for up to batch_rows consecutive data rows,
+    so row-independent work can run one chunk at a time without holding the whole file.
+    See iter_csv for header detection and footer/comment handling.
+    """
+    header, data_rows, header_row_1based = iter_csv(
+        path, delimiter, has_header, comment_char, encoding, text_override, skip_lines
+    )
+
+    def batches() -> Iterator[dict[str, list[str]]]:
+        while True:
+            batch = list(islice(data_rows, batch_rows))
+            if not batch:
+                return
+            yield dict(zip(header, map(list, zip(*batch))))
+
+    return (header, batches(), header_row_1based)
+
+
+def column_rows(
+    columns: list[str],
+    col_data: dict[str, list[str]],
+    indices: Iterable[int] | None = None,
+) -> list[dict[str, str]]:
+    """Rebuild row dicts (for output) from column lists, optionally only for the given row indices."""
+    cols = [(c, col_data.get(c, [])) for c in columns]
+    if indices is None:
+        indices = range(len(cols[0][1]) if cols else 0)
+    return [{c: values[i] for c, values in cols} for i in indices]
+
+
+def column_tuples(
+    columns: list[str],
+    col_data: dict[str, list[str]],
+    indices: Iterable[int] | None = None,
+) -> Iterator[tuple[str, ...]]:
+    """Positional rows (for CSV output) from column lists, optionally only for the given row indices."""
+    cols = [col_data.get(c, []) for c in columns]
+    if indices is not None:
+        indices = list(indices)
+        cols = [list(map(values.__getitem__, indices)) for values in cols]
+    return zip(*cols)
+
+
 def write_csv(
     columns: list[str],
-    rows: list[dict[str, str]],
+    rows: Iterable[dict[str, str]],
     delimiter: str = ",",
     stream: Any = None,
 ) -> None:
     """Write CSV to stream (default stdout)."""
     if stream is None:
         stream = sys.stdout
-    writer = csv.DictWriter(stream, fieldnames=columns, delimiter=delimiter, extrasaction="ignore")
-    writer.writeheader()
-    for row in rows:
-        writer.writerow({c: row.get(c, "") for c in columns})
+    _write_csv_batched(stream, columns, ([row.get(c, "") for c in columns] for row in rows), delimiter)
+
+
+def write_csv_rows(
+    columns: list[str],
+    rows: Iterable[Sequence[str]],
+    delimiter: str = ",",
+    stream: Any = None,
+) -> None:
+    """Write CSV to stream (default stdout) from positional rows already in column order."""
+    if stream is None:
+        stream = sys.stdout
+    _write_csv_batched(stream, columns, rows, delimiter)
+
+
+def _write_csv_batched(stream: Any, columns: list[str], rows: Iterable[Sequence[str]], delimiter: str) -> None:
+    """
+    Format header and rows into an in-memory buffer and pass it to stream every WRITE_BATCH_ROWS rows,
+    so the stream sees a few large writes (one encode each) instead of one small write per row.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf, delimiter=delimiter)
+    writer.writerow(columns)
+    rows = iter(rows)
+    while True:
+        stream.write(buf.getvalue())
+        buf.seek(0)
+        buf.truncate()
+        batch = list(islice(rows, WRITE_BATCH_ROWS))
+        if not batch:
+            break
+        writer.writerows(batch)
 
 
 def sniff_type(value: str) -> str:
@@ -169,11 +368,15 @@ def sniff_type(value: str) -> str:
     s = value.strip()
     if not s:
         return "empty"
-    try:
-        float(s)
+    if _NUM_RE.match(s):
         return "number"
-    except ValueError:
-        pass
+    # Only nan/inf spellings and digit-grouping underscores still need float(); skip the raise/catch otherwise.
+    if "_" in s or s.lstrip("+-")[:1] in _FLOAT_SPECIAL_START:
+        try:
+            float(s)
+            return "number"
+        except ValueError:
+            pass
     return "string"
 
 
@@ -186,10 +389,16 @@ def parse_delimiter(s: str) -> str:
 
 def write_json(data: Any, compact: bool = False) -> None:
     """Write JSON to stdout (for scripts that output JSON)."""
-    import json
-
     if compact:
-        json.dump(data, sys.stdout, ensure_ascii=False, separators=(",", ":"))
+        # dumps() encodes in one shot, which lets the compact path use the C encoder; dump() never does.
+        sys.stdout.write(json.dumps(data, ensure_ascii=False, separators=(",", ":")))
     else:
-        json.dump(data, sys.stdout, ensure_ascii=False, indent=2, sort_keys=True)
+        # Indented output is encoded in Python either way; write it in batches of chunks rather than
+        # joining every chunk at once (several times the output size) or writing each one separately.
+        chunks = json.JSONEncoder(ensure_ascii=False, indent=2, sort_keys=True).iterencode(data)
+        while True:
+            batch = list(islice(chunks, JSON_WRITE_BATCH_CHUNKS))
+            if not batch:
+                break
+            sys.stdout.write("".join(batch))
     sys.stdout.write("\n")
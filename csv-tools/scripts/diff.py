@@ -9,7 +9,7 @@ from __future__ import annotations
 import argparse
 from typing import Any
 
-from common import load_csv, parse_delimiter, write_json
+from common import column_rows, load_columns, parse_delimiter, write_json
 
 
 def add_dialect_args(parser: argparse.ArgumentParser) -> None:
@@ -20,8 +20,19 @@ def add_dialect_args(parser: argparse.ArgumentParser) -> None:
     parser.add_argument("--encoding", default="utf-8", help="File encoding.")
 
 
-def row_key(row: dict[str, str], key_columns: list[str]) -> tuple:
-    return tuple((row.get(c, "") or "").strip() for c in key_columns)
+def row_keys(col_data: dict[str, list[str]], key_columns: list[str], n: int) -> list[tuple]:
+    """Key tuple per row, built by zipping the key columns (missing columns read as empty)."""
+    key_lists = [col_data.get(c) or [""] * n for c in key_columns]
+    return [tuple(v.strip() for v in vals) for vals in zip(*key_lists)]
+
+
+def row_values(columns: list[str], col_data: dict[str, list[str]]) -> list[tuple]:
+    """Value tuple per row over the distinct columns; equal tuples mean equal row dicts."""
+    return list(zip(*[col_data[c] for c in dict.fromkeys(columns)]))
+
+
+def row_dict(columns: list[str], col_data: dict[str, list[str]], i: int) -> dict[str, str]:
+    return {c: col_data[c][i] for c in columns}
 
 
 def main() -> None:
@@ -42,37 +53,53 @@ def main() -> None:
         "skip_lines": args.skip_lines,
     }
 
-    _, left_rows = load_csv(args.left, **dialect)[:2]
-    _, right_rows = load_csv(args.right, **dialect)[:2]
+    left_columns, left_data = load_columns(args.left, **dialect)[:2]
+    right_columns, right_data = load_columns(args.right, **dialect)[:2]
+    n_left = len(left_data[left_columns[0]]) if left_columns else 0
+    n_right = len(right_data[right_columns[0]]) if right_columns else 0
+
+    # Compare rows as value tuples (built once) when both files share a column layout; otherwise as dicts.
+    if list(dict.fromkeys(left_columns)) == list(dict.fromkeys(right_columns)):
+        left_vals: list[Any] = row_values(left_columns, left_data)
+        right_vals: list[Any] = row_values(right_columns, right_data)
+    else:
+        left_vals = column_rows(left_columns, left_data)
+        right_vals = column_rows(right_columns, right_data)
+
+    def left_row(i: int) -> dict[str, str]:
+        return row_dict(left_columns, left_data, i)
+
+    def right_row(i: int) -> dict[str, str]:
+        return row_dict(right_columns, right_data, i)
 
     key_cols: list[str] | None = [c.strip() for c in args.key.split(",")] if args.key else None
 
     changes: list[dict[str, Any]] = []
 
     if key_cols:
-        left_by_key = {row_key(r, key_cols): r for r in left_rows}
-        right_by_key = {row_key(r, key_cols): r for r in right_rows}
-        left_keys = set(left_by_key)
-        right_keys = set(right_by_key)
-        for k in left_keys - right_keys:
-            changes.append({"kind": "removed", "key": list(k), "left": left_by_key[k]})
-        for k in right_keys - left_keys:
-            changes.append({"kind": "added", "key": list(k), "right": right_by_key[k]})
-        for k in left_keys & right_keys:
-            lr, rr = left_by_key[k], right_by_key[k]
-            if lr != rr:
-                changes.append({"kind": "changed", "key": list(k), "left": lr, "right": rr})
+        left_by_key = {k: i for i, k in enumerate(row_keys(left_data, key_cols, n_left))}
+        right_by_key = {k: i for i, k in enumerate(row_keys(right_data, key_cols, n_right))}
+        for k, i in left_by_key.items():
+            if k not in right_by_key:
+                changes.append({"kind": "removed", "key": list(k), "left": left_row(i)})
+        for k, j in right_by_key.items():
+            if k not in left_by_key:
+                changes.append({"kind": "added", "key": list(k), "right": right_row(j)})
+        for k, i in left_by_key.items():
+            j = right_by_key.get(k)
+            if j is not None and left_vals[i] != right_vals[j]:
+                changes.append({"kind": "changed", "key": list(k), "left": left_row(i), "right": right_row(j)})
     else:
         # Row-order diff
-        for i, (lr, rr) in enumerate(zip(left_rows, right_rows)):
-            if lr != rr:
-                changes.append({"kind": "changed", "row_index": i, "left": lr, "right": rr})
-        if len(left_rows) > len(right_rows):
-            for i in range(len(right_rows), len(left_rows)):
-                changes.append({"kind": "removed", "row_index": i, "left": left_rows[i]})
-        elif len(right_rows) > len(left_rows):
-            for i in range(len(left_rows), len(right_rows)):
-                changes.append({"kind": "added", "row_index": i, "right": right_rows[i]})
+        for i, (lv, rv) in enumerate(zip(left_vals, right_vals)):
+            if lv != rv:
+                changes.append({"kind": "changed", "row_index": i, "left": left_row(i), "right": right_row(i)})
+        if n_left > n_right:
+            for i in range(n_right, n_left):
+                changes.append({"kind": "removed", "row_index": i, "left": left_row(i)})
+        elif n_right > n_left:
+            for i in range(n_left, n_right):
+                changes.append({"kind": "added", "row_index": i, "right": right_row(i)})
 
     if args.format == "text":
         if not changes:
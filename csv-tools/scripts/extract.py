@@ -8,8 +8,10 @@ from __future__ import annotations
 
 import argparse
 import sys
+from collections import deque
+from typing import Iterable
 
-from common import load_csv, parse_delimiter, write_csv, write_json
+from common import iter_csv, parse_delimiter, write_csv_rows, write_json
 
 
 def add_dialect_args(parser: argparse.ArgumentParser) -> None:
@@ -36,14 +38,16 @@ def main() -> None:
     parser.add_argument("--format", choices=["csv", "json"], default="csv", help="Output format (default: csv).")
     parser.add_argument("--compact", action="store_true", help="Emit compact JSON when --format json.")
     args = parser.parse_args()
+    delim = parse_delimiter(args.delimiter)
 
-    columns, rows = load_csv(
+    columns, data_rows = iter_csv(
         args.input,
-        delimiter=parse_delimiter(args.delimiter),
+        delimiter=delim,
         has_header=not args.no_header,
         comment_char=args.comment_char,
         encoding=args.encoding,
         skip_lines=args.skip_lines,
+        limit=args.first,
     )[:2]
 
     out_columns = parse_fields(args.fields) if args.fields else columns
@@ -51,16 +55,19 @@ def main() -> None:
     if not out_columns:
         out_columns = columns
 
-    if args.first is not None:
-        rows = rows[: max(0, args.first)]
-    if args.last is not None:
-        rows = rows[-max(0, args.last) :]
+    rows: Iterable[list[str]] = data_rows
+    if args.last is not None and args.last > 0:
+        # Keep only a window of the last N rows while streaming.
+        rows = deque(rows, maxlen=args.last)
 
-    out_rows = [dict((k, r.get(k, "")) for k in out_columns) for r in rows]
+    # Later duplicates of a column name win, matching load_csv's row dicts.
+    col_index = {c: i for i, c in enumerate(columns)}
+    positions = [col_index[c] for c in out_columns]
+    out_values = ([r[i] for i in positions] for r in rows)
     if args.format == "csv":
-        write_csv(out_columns, out_rows, parse_delimiter(args.delimiter), sys.stdout)
+        write_csv_rows(out_columns, out_values, delim, sys.stdout)
     else:
-        write_json(out_rows, compact=args.compact)
+        write_json([dict(zip(out_columns, v)) for v in out_values], compact=args.compact)
 
 
 if __name__ == "__main__":
@@ -10,9 +10,10 @@ import argparse
 import operator
 import re
 import sys
-from typing import Callable
+from itertools import compress, repeat
+from typing import Any, Callable, Iterable, Iterator
 
-from common import load_csv, parse_delimiter, write_csv, write_json
+from common import column_rows, column_tuples, iter_column_batches, parse_delimiter, write_csv_rows, write_json
 
 OPS: dict[str, Callable[[str, str], bool]] = {
     "==": operator.eq,
@@ -23,6 +24,20 @@ OPS: dict[str, Callable[[str, str], bool]] = {
     "<=": operator.le,
 }
 EXPR_RE = re.compile(r"^(.+?)(==|!=|>=|<=|>|<)(.+)$")
+# Backreferences and conditionals depend on group numbering/names, which change when patterns are merged.
+GROUP_REF_RE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+# A predicate maps (col_data, stripped-column cache, row count, row indices or None for all rows)
+# to one boolean per evaluated row.
+Predicate = Callable[[dict[str, list[str]], dict[str, list[str]], int, "list[int] | None"], list[bool]]
+
+# Relative evaluation cost of each condition kind; cheaper conditions run first so the
+# costlier ones only see the rows that are still undecided.
+COST_EMPTY = 0
+COST_EQUALITY = 1
+COST_CONTAINS = 2
+COST_ORDERING = 3
+COST_REGEX = 4
 
 
 def add_dialect_args(parser: argparse.ArgumentParser) -> None:
@@ -39,7 +54,31 @@ def parse_rhs(raw: str) -> str:
     return s
 
 
-def compare_condition(expr: str) -> Callable[[dict[str, str]], bool]:
+def column_values(col_data: dict[str, list[str]], col: str, n: int, rows: list[int] | None = None) -> list[str]:
+    """Values of a column (only at the given row indices, if any); a missing column reads as empty."""
+    values = col_data.get(col)
+    if values is None:
+        return [""] * (n if rows is None else len(rows))
+    return values if rows is None else list(map(values.__getitem__, rows))
+
+
+def stripped_values(
+    col_data: dict[str, list[str]],
+    stripped: dict[str, list[str]],
+    col: str,
+    n: int,
+    rows: list[int] | None = None,
+) -> list[str]:
+    """Stripped values of a column; whole columns are stripped once and shared by every predicate."""
+    values = stripped.get(col)
+    if values is None:
+        if rows is not None:
+            return list(map(str.strip, column_values(col_data, col, n, rows)))
+        values = stripped[col] = list(map(str.strip, column_values(col_data, col, n, rows)))
+    return values if rows is None else list(map(values.__getitem__, rows))
+
+
+def compare_condition(expr: str) -> tuple[int, Predicate]:
     match = EXPR_RE.match(expr.strip())
     if not match:
         raise ValueError(f"Invalid --where expression: {expr!r}")
@@ -48,39 +87,98 @@ def compare_condition(expr: str) -> Callable[[dict[str, str]], bool]:
     rhs_val = parse_rhs(rhs)
     comp = OPS[op]
 
-    def pred(row: dict[str, str]) -> bool:
-        val = row.get(field, "")
-        return comp(val, rhs_val)
+    def pred(col_data: dict[str, list[str]], stripped: dict[str, list[str]], n: int, rows: list[int] | None) -> list[bool]:
+        return list(map(comp, column_values(col_data, field, n, rows), repeat(rhs_val)))
 
-    return pred
+    return (COST_EQUALITY if op in ("==", "!=") else COST_ORDERING), pred
 
 
-def in_condition(col: str, values: list[str]) -> Callable[[dict[str, str]], bool]:
-    val_set = {v.strip() for v in values}
+def in_condition(col: str, values: list[str]) -> tuple[int, Predicate]:
+    is_member = frozenset(v.strip() for v in values).__contains__
 
-    def pred(row: dict[str, str]) -> bool:
-        return (row.get(col, "") or "").strip() in val_set
+    def pred(col_data: dict[str, list[str]], stripped: dict[str, list[str]], n: int, rows: list[int] | None) -> list[bool]:
+        return list(map(is_member, stripped_values(col_data, stripped, col, n, rows)))
 
-    return pred
+    return COST_EQUALITY, pred
 
 
-def contains_condition(col: str, substring: str) -> Callable[[dict[str, str]], bool]:
-    def pred(row: dict[str, str]) -> bool:
-        return substring in (row.get(col, "") or "")
+def contains_condition(col: str, substring: str) -> tuple[int, Predicate]:
+    def pred(col_data: dict[str, list[str]], stripped: dict[str, list[str]], n: int, rows: list[int] | None) -> list[bool]:
+        return list(map(str.__contains__, column_values(col_data, col, n, rows), repeat(substring)))
 
-    return pred
+    return COST_CONTAINS, pred
 
 
-def regex_condition(col: str, pattern: str) -> Callable[[dict[str, str]], bool]:
+def compile_regex(pattern: str) -> re.Pattern[str]:
     try:
-        compiled = re.compile(pattern)
+        return re.compile(pattern)
     except re.error as e:
         raise ValueError(f"Invalid --regex pattern: {e}") from e
 
-    def pred(row: dict[str, str]) -> bool:
-        return bool(compiled.search(row.get(col, "") or ""))
 
-    return pred
+def regex_condition(col: str, pattern: str) -> tuple[int, Predicate]:
+    search = compile_regex(pattern).search
+
+    def pred(col_data: dict[str, list[str]], stripped: dict[str, list[str]], n: int, rows: list[int] | None) -> list[bool]:
+        return list(map(bool, map(search, column_values(col_data, col, n, rows))))
+
+    return COST_REGEX, pred
+
+
+def merge_patterns(patterns: list[str]) -> str | None:
+    """
+    Merge regex patterns into one alternation so a value is scanned once for all of them (OR semantics).
+    Each pattern must already compile on its own: invalid patterns can merge into a valid alternation.
+    Returns None when the patterns cannot be merged safely (group references, inline global flags or
+    duplicate group names); callers then fall back to one predicate per pattern.
+    """
+    if any(GROUP_REF_RE.search(p) for p in patterns):
+        return None
+    merged = "|".join(f"(?:{p})" for p in patterns)
+    try:
+        re.compile(merged)
+    except re.error:
+        return None
+    return merged
+
+
+def empty_condition(col: str, invert: bool = False) -> tuple[int, Predicate]:
+    test = bool if invert else operator.not_
+
+    def pred(col_data: dict[str, list[str]], stripped: dict[str, list[str]], n: int, rows: list[int] | None) -> list[bool]:
+        return list(map(test, stripped_values(col_data, stripped, col, n, rows)))
+
+    return COST_EMPTY, pred
+
+
+def select_rows(preds: list[tuple[int, Predicate]], col_data: dict[str, list[str]], n: int, use_or: bool) -> Iterable[int]:
+    """
+    Indices of the rows that satisfy the predicates (all of them, or any with use_or), in file order.
+    Predicates run cheapest first, each over whole columns via map() so the per-row loop stays in C,
+    and each only over the rows still undecided: with AND a row drops out at its first failing
+    predicate, with OR at its first passing one.
+    """
+    if not preds:
+        return range(n)
+    stripped: dict[str, list[str]] = {}
+    ranked = sorted(preds, key=operator.itemgetter(0))
+    if not use_or:
+        rows: list[int] | None = None
+        for _, pred in ranked:
+            rows = list(compress(range(n) if rows is None else rows, pred(col_data, stripped, n, rows)))
+            if not rows:
+                break
+        return rows or []
+    accepted: list[int] = []
+    pending: list[int] | None = None
+    for _, pred in ranked:
+        mask = pred(col_data, stripped, n, pending)
+        candidates = range(n) if pending is None else pending
+        accepted.extend(compress(candidates, mask))
+        pending = list(compress(candidates, map(operator.not_, mask)))
+        if not pending:
+            break
+    return sorted(accepted)
 
 
 def main() -> None:
@@ -96,17 +194,18 @@ def main() -> None:
     parser.add_argument("--format", choices=["csv", "json"], default="csv", help="Output format (default: csv).")
     parser.add_argument("--compact", action="store_true", help="Emit compact JSON when --format json.")
     args = parser.parse_args()
+    delim = parse_delimiter(args.delimiter)
 
-    columns, rows = load_csv(
+    columns, batches = iter_column_batches(
         args.input,
-        delimiter=parse_delimiter(args.delimiter),
+        delimiter=delim,
         has_header=not args.no_header,
         comment_char=args.comment_char,
         encoding=args.encoding,
         skip_lines=args.skip_lines,
     )[:2]
 
-    preds: list[Callable[[dict[str, str]], bool]] = []
+    preds: list[tuple[int, Predicate]] = []
     for expr in args.where:
         preds.append(compare_condition(expr))
     if args.in_spec:
@@ -119,31 +218,38 @@ def main() -> None:
             raise ValueError("--contains must be column:substring")
         col, substring = spec.split(":", 1)
         preds.append(contains_condition(col.strip(), substring))
+    regex_specs: dict[str, list[str]] = {}
     for spec in args.regex:
         if ":" not in spec:
             raise ValueError("--regex must be column:pattern")
         col, pattern = spec.split(":", 1)
-        preds.append(regex_condition(col.strip(), pattern))
+        # Checked on its own and in argument order, before any merging.
+        compile_regex(pattern)
+        regex_specs.setdefault(col.strip(), []).append(pattern)
+    for col, patterns in regex_specs.items():
+        # With --or, several patterns on one column collapse into a single scan per value.
+        merged = merge_patterns(patterns) if args.use_or and len(patterns) > 1 else None
+        if merged is not None:
+            preds.append(regex_condition(col, merged))
+        else:
+            for pattern in patterns:
+                preds.append(regex_condition(col, pattern))
     for col in args.empty:
-        c = col.strip()
-        preds.append(lambda row, c=c: not (row.get(c, "") or "").strip())
+        preds.append(empty_condition(col.strip()))
     for col in args.non_empty:
-        c = col.strip()
-        preds.append(lambda row, c=c: bool((row.get(c, "") or "").strip()))
-
-    def combined(row: dict[str, str]) -> bool:
-        if not preds:
-            return True
-        if args.use_or:
-            return any(p(row) for p in preds)
-        return all(p(row) for p in preds)
+        preds.append(empty_condition(col.strip(), invert=True))
 
-    filtered = [r for r in rows if combined(r)]
+    # Rows are independent, so the file is filtered one column batch at a time and only the
+    # current batch (plus, for JSON, the kept rows) is ever held in memory.
+    def kept(build: Callable[..., Iterable[Any]]) -> Iterator[Any]:
+        for col_data in batches:
+            n = len(col_data[columns[0]])
+            yield from build(columns, col_data, select_rows(preds, col_data, n, args.use_or))
 
     if args.format == "csv":
-        write_csv(columns, filtered, parse_delimiter(args.delimiter), sys.stdout)
+        write_csv_rows(columns, kept(column_tuples), delim, sys.stdout)
     else:
-        write_json(filtered, compact=args.compact)
+        write_json(list(kept(column_rows)), compact=args.compact)
 
 
 if __name__ == "__main__":
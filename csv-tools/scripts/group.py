@@ -7,9 +7,13 @@
 from __future__ import annotations
 
 import argparse
-from collections import defaultdict
+import heapq
+from collections import Counter
+from typing import Iterable
 
-from common import load_csv, parse_delimiter, write_json
+from common import load_columns, parse_delimiter, write_json
+
+NUMERIC_AGGS = {"sum", "min", "max", "mean"}
 
 
 def add_dialect_args(parser: argparse.ArgumentParser) -> None:
@@ -48,25 +52,40 @@ def compute_agg(values: list[str], func: str):
                 seen_set.add(v)
                 seen.append(v)
         return seen
-    nums = []
+    return reduce_numbers(parse_numbers(values), func)
+
+
+def parse_numbers(values: list[str]) -> list[float | None]:
+    """Parse a column once: float for numeric cells, None for empty or non-numeric cells."""
+    try:
+        # Fully numeric column: one C-level map (float() itself ignores surrounding whitespace).
+        return list(map(float, values))
+    except ValueError:
+        pass
+    nums: list[float | None] = []
     for v in values:
-        v = (v or "").strip()
         if not v:
+            nums.append(None)
             continue
         try:
             nums.append(float(v))
         except ValueError:
-            pass
-    if not nums:
+            nums.append(None)
+    return nums
+
+
+def reduce_numbers(nums: Iterable[float | None], func: str):
+    present = [x for x in nums if x is not None]
+    if not present:
         return None
     if func == "sum":
-        return sum(nums)
+        return sum(present)
     if func == "min":
-        return min(nums)
+        return min(present)
     if func == "max":
-        return max(nums)
+        return max(present)
     if func == "mean":
-        return sum(nums) / len(nums)
+        return sum(present) / len(present)
     return None
 
 
@@ -80,7 +99,7 @@ def main() -> None:
     parser.add_argument("--compact", action="store_true", help="Emit compact JSON.")
     args = parser.parse_args()
 
-    columns, rows = load_csv(
+    columns, col_data = load_columns(
         args.input,
         delimiter=parse_delimiter(args.delimiter),
         has_header=not args.no_header,
@@ -88,6 +107,7 @@ def main() -> None:
         encoding=args.encoding,
         skip_lines=args.skip_lines,
     )[:2]
+    n = len(col_data[columns[0]]) if columns else 0
 
     by_fields = parse_fields(args.by)
     by_fields = [f for f in by_fields if f in columns]
@@ -96,30 +116,62 @@ def main() -> None:
 
     agg_specs = [parse_agg(s) for s in args.agg]
 
-    groups: dict[tuple, list[dict]] = defaultdict(list)
-    for row in rows:
-        key = tuple((row.get(f, "") or "").strip() for f in by_fields)
-        groups[key].append(row)
+    keys = zip(*[map(str.strip, col_data[f]) for f in by_fields])
+    members: list[list[int]] = []
+    if not agg_specs:
+        # Count-only: Counter tallies keys in C (first-seen order); no per-group row lists.
+        key_counts = Counter(keys)
+        uniques = list(key_counts)
+        counts = list(key_counts.values())
+    else:
+        # Factorize group keys: unique keys in first-seen order, then one integer group code per row.
+        key_list = list(keys)
+        uniques = list(dict.fromkeys(key_list))
+        code_of = {k: g for g, k in enumerate(uniques)}
+        members = [[] for _ in uniques]
+        for i, g in enumerate(map(code_of.__getitem__, key_list)):
+            members[g].append(i)
+        counts = list(map(len, members))
+
+    # Numeric aggregations parse each column once, shared across groups and functions.
+    numeric_cols: dict[str, list[float | None]] = {}
+    for agg_field, agg_func in agg_specs:
+        if agg_func in NUMERIC_AGGS and agg_field not in numeric_cols:
+            numeric_cols[agg_field] = parse_numbers(col_data.get(agg_field) or [""] * n)
+
+    # Order (and trim to --top) the group codes first, so aggregations run only for emitted groups.
+    order: list[int]
+    if args.sort == "count":
+        if args.top is not None and args.top < len(uniques):
+            # nlargest is stable like sort(reverse=True), but O(G log N) instead of O(G log G).
+            order = heapq.nlargest(max(0, args.top), range(len(uniques)), key=counts.__getitem__)
+        else:
+            order = sorted(range(len(uniques)), key=counts.__getitem__, reverse=True)
+    else:
+        order = sorted(range(len(uniques)), key=uniques.__getitem__)
+    if args.top is not None:
+        order = order[: max(0, args.top)]
 
     out_rows: list[dict] = []
-    for key_tuple, group_rows in groups.items():
-        row_dict = dict(zip(by_fields, key_tuple))
-        row_dict["count"] = len(group_rows)
+    for g in order:
+        row_dict = dict(zip(by_fields, uniques[g]))
+        row_dict["count"] = counts[g]
+        if not agg_specs:
+            out_rows.append(row_dict)
+            continue
+        group_idx = members[g]
         for agg_field, agg_func in agg_specs:
-            vals = [(r.get(agg_field, "") or "").strip() for r in group_rows]
             label = f"{agg_field}:{agg_func}"
+            if agg_func in NUMERIC_AGGS:
+                nums = numeric_cols[agg_field]
+                row_dict[label] = reduce_numbers([nums[i] for i in group_idx], agg_func)
+                continue
+            agg_col = col_data.get(agg_field)
+            vals = [agg_col[i].strip() for i in group_idx] if agg_col is not None else [""] * len(group_idx)
             row_dict[label] = compute_agg(vals, agg_func)
         out_rows.append(row_dict)
 
-    if args.sort == "count":
-        out_rows.sort(key=lambda r: r["count"], reverse=True)
-    else:
-        out_rows.sort(key=lambda r: tuple(r.get(f, "") for f in by_fields))
-
-    if args.top is not None:
-        out_rows = out_rows[: max(0, args.top)]
-
-    result = {"total_records": len(rows), "total_groups": len(groups), "groups": out_rows}
+    result = {"total_records": n, "total_groups": len(uniques), "groups": out_rows}
     write_json(result, compact=args.compact)
 
 
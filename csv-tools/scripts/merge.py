@@ -9,7 +9,7 @@ from __future__ import annotations
 import argparse
 import sys
 
-from common import load_csv, parse_delimiter, write_csv, write_json
+from common import iter_csv, parse_delimiter, write_csv_rows, write_json
 
 
 def main() -> None:
@@ -26,11 +26,13 @@ def main() -> None:
     args = parser.parse_args()
 
     all_columns: list[str] | None = None
-    all_rows: list[dict[str, str]] = []
+    all_rows: list[list[str]] = []
     delim = parse_delimiter(args.delimiter)
+    seen: set[str] = set()
+    unique_pos: int | None = None
 
     for path in args.inputs:
-        columns, rows = load_csv(
+        columns, rows = iter_csv(
             path,
             delimiter=delim,
             has_header=not args.no_header,
@@ -40,30 +42,28 @@ def main() -> None:
         )[:2]
         if all_columns is None:
             all_columns = columns
+            if args.unique_by and args.unique_by in all_columns:
+                unique_pos = all_columns.index(args.unique_by)
+        # Project each row onto the first file's columns by position (later duplicate names win).
+        col_index = {c: i for i, c in enumerate(columns)}
+        positions = [col_index.get(c) for c in all_columns]
         for row in rows:
-            if all_columns and columns == all_columns:
-                all_rows.append(dict(row))
-            else:
-                all_rows.append({c: row.get(c, "") for c in all_columns})
+            values = [row[i] if i is not None else "" for i in positions]
+            if unique_pos is not None:
+                # Deduplicate while reading (keep first occurrence) instead of in a second pass.
+                key = values[unique_pos].strip()
+                if key in seen:
+                    continue
+                seen.add(key)
+            all_rows.append(values)
 
     if all_columns is None:
         all_columns = []
 
-    if args.unique_by and all_columns and args.unique_by in all_columns:
-        seen: set[str] = set()
-        deduped: list[dict[str, str]] = []
-        for row in all_rows:
-            key = (row.get(args.unique_by) or "").strip()
-            if key in seen:
-                continue
-            seen.add(key)
-            deduped.append(row)
-        all_rows = deduped
-
     if args.format == "csv":
-        write_csv(all_columns, all_rows, delim, sys.stdout)
+        write_csv_rows(all_columns, all_rows, delim, sys.stdout)
     else:
-        write_json(all_rows, compact=args.compact)
+        write_json([dict(zip(all_columns, values)) for values in all_rows], compact=args.compact)
 
 
 if __name__ == "__main__":
@@ -9,42 +9,42 @@ from __future__ import annotations
 import argparse
 import csv
 import io
-import sys
+from collections import Counter
+from itertools import islice
 from pathlib import Path
+from typing import Iterable
 
 from common import (
     DEFAULT_ENCODING,
-    _lines_filter_comment,
+    iter_csv,
     parse_delimiter,
-    read_text,
+    read_input,
     write_json,
 )
 
 
-def detect_delimiter(lines: list[str], comment_char: str | None) -> str:
+def count_fields(line: str, delim: str) -> int:
+    """Number of fields in a single line; only lines containing quotes need a real CSV parse."""
+    if '"' not in line:
+        return line.count(delim) + 1
+    return len(next(csv.reader((line,), delimiter=delim), ()))
+
+
+def detect_delimiter(lines: Iterable[str], comment_char: str | None) -> str:
     """Try comma, tab, semicolon; pick the one that yields most consistent column count in first 20 lines."""
     candidates = [",", "\t", ";"]
-    filtered = _lines_filter_comment(lines, comment_char)
-    if not filtered:
-        return ","
-
+    # Only the first 30 non-comment lines are sampled, so stop reading lines once they are collected.
+    if comment_char:
+        lines = (line for line in lines if not line.strip().startswith(comment_char))
+    sample = [line for line in islice(lines, 30) if line.strip()]  # skip leading/blank lines
     best_delim: str = ","
     best_score = -1
 
     for delim in candidates:
-        counts: list[int] = []
-        for line in filtered[:30]:
-            if not line.strip():
-                continue  # skip leading/blank lines
-            parsed = list(csv.reader(io.StringIO(line), delimiter=delim))
-            if not parsed:
-                continue
-            row = parsed[0]
-            counts.append(len(row))
+        counts = [c for c in (count_fields(line, delim) for line in sample) if c]
         if not counts:
             continue
         # Prefer delimiter that gives same count across lines (mode).
-        from collections import Counter
         mode_count = Counter(counts).most_common(1)[0]
         score = mode_count[1] * (mode_count[0] if mode_count[0] > 1 else 0)
         if score > best_score:
@@ -65,16 +65,20 @@ def main() -> None:
     parser.add_argument("--compact", action="store_true", help="Emit compact JSON.")
     args = parser.parse_args()
 
-    text = read_text(args.input, args.encoding)
-    lines = text.splitlines()
-    size_bytes = len(text.encode(args.encoding))
+    # A regular file is never read into memory: the delimiter comes from its first lines and the rows
+    # are streamed and counted. Input that cannot be read twice (stdin, a pipe) is buffered as text.
+    text, size_bytes = read_input(args.input, args.encoding)
 
     comment_char = args.comment_char
-    delimiter = parse_delimiter(args.delimiter) if args.delimiter else detect_delimiter(lines, comment_char)
-
-    from common import load_csv
-
-    columns, rows, header_row = load_csv(
+    if args.delimiter:
+        delimiter = parse_delimiter(args.delimiter)
+    elif text is not None:
+        delimiter = detect_delimiter(io.StringIO(text, newline=None), comment_char)
+    else:
+        with open(args.input, encoding=args.encoding) as f:
+            delimiter = detect_delimiter(f, comment_char)
+
+    columns, data_rows, header_row = iter_csv(
         args.input,
         delimiter=delimiter,
         has_header=not args.no_header,
@@ -84,13 +88,15 @@ def main() -> None:
         skip_lines=args.skip_lines,
     )
 
-    sample = rows[0] if rows else {}
+    first = next(data_rows, None)
+    record_count = 0 if first is None else 1 + sum(1 for _ in data_rows)
+    sample = dict(zip(columns, first)) if first is not None else {}
     result = {
         "valid": True,
         "delimiter": delimiter,
         "has_header": not args.no_header,
         "header_row": header_row,
-        "record_count": len(rows),
+        "record_count": record_count,
         "columns": columns,
         "encoding": args.encoding,
         "size_bytes": size_bytes,
@@ -9,7 +9,7 @@ from __future__ import annotations
 import argparse
 import sys
 
-from common import load_csv, parse_delimiter, write_csv, write_json
+from common import iter_csv, parse_delimiter, write_csv_rows, write_json
 
 
 def add_dialect_args(parser: argparse.ArgumentParser) -> None:
@@ -27,22 +27,30 @@ def main() -> None:
     parser.add_argument("--format", choices=["csv", "json"], default="csv", help="Output format (default: csv).")
     parser.add_argument("--compact", action="store_true", help="Emit compact JSON when --format json.")
     args = parser.parse_args()
+    delim = parse_delimiter(args.delimiter)
 
-    columns, rows = load_csv(
+    columns, data_rows = iter_csv(
         args.input,
-        delimiter=parse_delimiter(args.delimiter),
+        delimiter=delim,
         has_header=not args.no_header,
         comment_char=args.comment_char,
         encoding=args.encoding,
         skip_lines=args.skip_lines,
     )[:2]
 
-    reversed_rows = list(reversed(rows))
+    # Positional rows reversed in place: no row dicts and no second list.
+    rows = list(data_rows)
+    rows.reverse()
 
     if args.format == "csv":
-        write_csv(columns, reversed_rows, parse_delimiter(args.delimiter), sys.stdout)
+        if len(set(columns)) < len(columns):
+            # Later duplicates of a column name win, matching load_csv's row dicts.
+            col_index = {c: i for i, c in enumerate(columns)}
+            positions = [col_index[c] for c in columns]
+            rows = [[r[i] for i in positions] for r in rows]
+        write_csv_rows(columns, rows, delim, sys.stdout)
     else:
-        write_json(reversed_rows, compact=args.compact)
+        write_json([dict(zip(columns, r)) for r in rows], compact=args.compact)
 
 
 if __name__ == "__main__":
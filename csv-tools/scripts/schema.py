@@ -9,7 +9,7 @@ from __future__ import annotations
 import argparse
 from collections import Counter
 
-from common import load_csv, parse_delimiter, sniff_type, write_json
+from common import iter_column_batches, parse_delimiter, sniff_type, write_json
 
 
 def add_dialect_args(parser: argparse.ArgumentParser) -> None:
@@ -28,7 +28,7 @@ def main() -> None:
     parser.add_argument("--compact", action="store_true", help="Emit compact JSON.")
     args = parser.parse_args()
 
-    columns, rows = load_csv(
+    columns, batches = iter_column_batches(
         args.input,
         delimiter=parse_delimiter(args.delimiter),
         has_header=not args.no_header,
@@ -37,22 +37,38 @@ def main() -> None:
         skip_lines=args.skip_lines,
     )[:2]
 
+    # One pass per column batch: each column's cells are typed into its own Counter,
+    # so no row dicts are built and only the current batch is held in memory.
+    type_counters: dict[str, Counter] = {col: Counter() for col in columns}
+    # Columns still typed per distinct value (sniff once, weight by count); a column that turns out
+    # mostly unique is dropped from this set and typed cell by cell with map() instead.
+    by_value = set(columns)
+    record_count = 0
+    for col_data in batches:
+        record_count += len(col_data[columns[0]])
+        for col, values in col_data.items():
+            counter = type_counters[col]
+            if col in by_value:
+                freq = Counter(values)
+                for value, count in freq.items():
+                    counter[sniff_type(value)] += count
+                if len(freq) > len(values) // 2:
+                    by_value.discard(col)
+            else:
+                counter.update(map(sniff_type, values))
+
     fields: dict = {}
     for col in columns:
-        types_counter: Counter = Counter()
-        presence = 0
-        for row in rows:
-            val = row.get(col, "")
-            types_counter[sniff_type(val)] += 1
-            if (val or "").strip():
-                presence += 1
+        types_counter = type_counters[col]
         entry = {"types": sorted(types_counter.keys())}
         if args.counts:
-            entry["presence"] = f"{presence}/{len(rows)}"
+            # sniff_type reports "empty" exactly for blank cells, so presence is everything else.
+            presence = record_count - types_counter["empty"]
+            entry["presence"] = f"{presence}/{record_count}"
             entry["type_counts"] = dict(types_counter)
         fields[col] = entry
 
-    result = {"columns": columns, "record_count": len(rows), "fields": fields}
+    result = {"columns": columns, "record_count": record_count, "fields": fields}
     write_json(result, compact=args.compact)
 
 
@@ -9,7 +9,7 @@ from __future__ import annotations
 import argparse
 import sys
 
-from common import load_csv, parse_delimiter, write_csv, write_json
+from common import column_rows, column_tuples, load_columns, parse_delimiter, write_csv_rows, write_json
 
 
 def add_dialect_args(parser: argparse.ArgumentParser) -> None:
@@ -25,17 +25,29 @@ def parse_fields(raw: str) -> list[str]:
     return [f.strip() for f in raw.split(",") if f.strip()]
 
 
-def key_for_row(row: dict[str, str], fields: list[str], numeric: bool) -> tuple:
-    def norm(field: str):
-        v = (row.get(field, "") or "").strip()
-        if numeric and v:
-            try:
-                return float(v)
-            except ValueError:
-                pass
-        return v or (float("-inf") if numeric else "")
-
-    return tuple(norm(f) for f in fields)
+def key_column(values: list[str], numeric: bool) -> list:
+    """
+    Sort key of one column for every row: the stripped value, or with numeric a float for numeric
+    cells (empty cells sort first; other non-numeric cells keep their text).
+    """
+    stripped = list(map(str.strip, values))
+    if not numeric:
+        return stripped
+    try:
+        # Fully numeric column: one C-level map.
+        return list(map(float, stripped))
+    except ValueError:
+        pass
+    keys: list = []
+    for v in stripped:
+        if not v:
+            keys.append(float("-inf"))
+            continue
+        try:
+            keys.append(float(v))
+        except ValueError:
+            keys.append(v)
+    return keys
 
 
 def main() -> None:
@@ -47,10 +59,11 @@ def main() -> None:
     parser.add_argument("--format", choices=["csv", "json"], default="csv", help="Output format (default: csv).")
     parser.add_argument("--compact", action="store_true", help="Emit compact JSON when --format json.")
     args = parser.parse_args()
+    delim = parse_delimiter(args.delimiter)
 
-    columns, rows = load_csv(
+    columns, col_data = load_columns(
         args.input,
-        delimiter=parse_delimiter(args.delimiter),
+        delimiter=delim,
         has_header=not args.no_header,
         comment_char=args.comment_char,
         encoding=args.encoding,
@@ -62,16 +75,18 @@ def main() -> None:
     if not by_fields:
         by_fields = columns[:1]
 
-    sorted_rows = sorted(
-        rows,
-        key=lambda r: key_for_row(r, by_fields, args.numeric),
-        reverse=args.desc,
-    )
+    # Keys are computed once per row, column by column, then row indices are sorted (stable, also with
+    # reverse) and the output is gathered from the columns in that order.
+    n = len(col_data[columns[0]]) if columns else 0
+    key_cols = [key_column(col_data[f], args.numeric) for f in by_fields]
+    # A single sort column is used as-is; tuples are only built when there are several.
+    keys = key_cols[0] if len(key_cols) == 1 else list(zip(*key_cols))
+    order = sorted(range(n), key=keys.__getitem__, reverse=args.desc)
 
     if args.format == "csv":
-        write_csv(columns, sorted_rows, parse_delimiter(args.delimiter), sys.stdout)
+        write_csv_rows(columns, column_tuples(columns, col_data, order), delim, sys.stdout)
     else:
-        write_json(sorted_rows, compact=args.compact)
+        write_json(column_rows(columns, col_data, order), compact=args.compact)
 
 
 if __name__ == "__main__":
@@ -8,8 +8,9 @@ from __future__ import annotations
 
 import argparse
 from collections import Counter
+from typing import Iterable
 
-from common import load_csv, parse_delimiter, sniff_type, write_json
+from common import load_columns, parse_delimiter, sniff_type, write_json
 
 
 def add_dialect_args(parser: argparse.ArgumentParser) -> None:
@@ -27,16 +28,22 @@ def parse_fields(raw: str | None) -> list[str]:
     return [f.strip() for f in raw.split(",") if f.strip()]
 
 
-def numeric_summary(values: list[str]) -> dict | None:
-    nums: list[float] = []
-    for v in values:
-        v = (v or "").strip()
-        if not v:
-            continue
-        try:
-            nums.append(float(v))
-        except ValueError:
-            pass
+def numeric_summary(values: list[str], distinct: Iterable[str]) -> dict | None:
+    """Numeric count/min/max/mean of a column; each distinct value (e.g. the keys of its Counter) is parsed once."""
+    try:
+        # Fully numeric column: one C-level map.
+        nums = list(map(float, values))
+    except ValueError:
+        parsed: dict[str, float] = {}
+        for v in distinct:
+            if not v:
+                continue
+            try:
+                parsed[v] = float(v)
+            except ValueError:
+                pass
+        # Back to one float per numeric cell, in row order, without a Python-level loop over the rows.
+        nums = list(map(parsed.__getitem__, filter(parsed.__contains__, values)))
     if not nums:
         return None
     return {
@@ -55,7 +62,7 @@ def main() -> None:
     parser.add_argument("--compact", action="store_true", help="Emit compact JSON.")
     args = parser.parse_args()
 
-    columns, rows = load_csv(
+    columns, col_data = load_columns(
         args.input,
         delimiter=parse_delimiter(args.delimiter),
         has_header=not args.no_header,
@@ -69,22 +76,25 @@ def main() -> None:
     if not selected:
         selected = columns
 
+    record_count = len(col_data[columns[0]]) if columns else 0
+
     field_stats: dict = {}
     for col in selected:
-        values = [row.get(col, "") or "" for row in rows]
-        presence = sum(1 for v in values if (v or "").strip())
+        values = col_data[col]
+        # Counting first means presence and numeric parsing only visit each distinct value once.
         freq = Counter(values)
+        presence = sum(map(freq.__getitem__, filter(str.strip, freq)))
         entry = {
-            "presence": f"{presence}/{len(rows)}",
+            "presence": f"{presence}/{record_count}",
             "unique_values": len(freq),
             "top_values": [{"value": k, "count": c} for k, c in freq.most_common(max(0, args.top))],
         }
-        num = numeric_summary(values)
+        num = numeric_summary(values, freq)
         if num:
             entry["numeric"] = num
         field_stats[col] = entry
 
-    result = {"record_count": len(rows), "field_count": len(selected), "fields": field_stats}
+    result = {"record_count": record_count, "field_count": len(selected), "fields": field_stats}
     write_json(result, compact=args.compact)
 
 
@@ -9,8 +9,10 @@ from __future__ import annotations
 import argparse
 import csv
 import io
+from collections import Counter
+from typing import Any, Iterable
 
-from common import _lines_filter_comment, parse_delimiter, read_text, write_json
+from common import parse_delimiter, read_input, write_json
 
 
 def main() -> None:
@@ -24,33 +26,36 @@ def main() -> None:
     parser.add_argument("--compact", action="store_true", help="Emit compact JSON.")
     args = parser.parse_args()
 
-    text = read_text(args.input, args.encoding)
-    lines = text.splitlines()
-    lines = _lines_filter_comment(lines, args.comment_char)
-
-    delim = parse_delimiter(args.delimiter)
-    reader = csv.reader(io.StringIO("\n".join(lines)), delimiter=delim)
-    rows = list(reader)
+    # Stream the rows instead of splitting and re-joining the whole text; only counts are kept.
+    text, size_bytes = read_input(args.input, args.encoding)
+    if text is None:
+        stream: Any = open(args.input, encoding=args.encoding)
+    else:
+        stream = io.StringIO(text, newline=None)
 
-    if not rows:
-        write_json({"valid": True, "record_count": 0, "message": "empty file"}, compact=args.compact)
-        return
+    with stream:
+        lines: Iterable[str] = stream
+        if args.comment_char:
+            comment_char = args.comment_char
+            lines = (line for line in lines if not line.strip().startswith(comment_char))
+        reader = csv.reader(lines, delimiter=parse_delimiter(args.delimiter))
+        first = next(reader, None)
+        if first is None:
+            write_json({"valid": True, "record_count": 0, "message": "empty file"}, compact=args.compact)
+            return
+        expected_len = len(first)
+        lengths = Counter(map(len, reader))
 
-    expected_len = len(rows[0])
-    if args.no_header:
-        data_rows = [r for r in rows if len(r) == expected_len]
-        skipped = sum(1 for r in rows if len(r) != expected_len)
-    else:
-        data_rows = [r for r in rows[1:] if len(r) == expected_len]
-        skipped = sum(1 for r in rows[1:] if len(r) != expected_len)
+    record_count = lengths[expected_len] + (1 if args.no_header else 0)
+    skipped = sum(lengths.values()) - lengths[expected_len]
 
     valid = skipped == 0 or not args.strict
     result = {
         "valid": valid,
-        "record_count": len(data_rows),
+        "record_count": record_count,
         "skipped_rows": skipped,
         "expected_columns": expected_len,
-        "size_bytes": len(text.encode(args.encoding)),
+        "size_bytes": size_bytes,
     }
     if not valid and args.strict:
         result["error"] = f"Inconsistent column count: {skipped} row(s) skipped (footer/comment lines)."
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# Copyright 2026 Yevgeniy Zaremba
+# SPDX-License-Identifier: Apache-2.0
+
+"""Regression checks for filter.py run as a command: python -m unittest discover csv-tools/tests"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+FILTER = Path(__file__).resolve().parent.parent / "scripts" / "filter.py"
+ROWS = "a,b\nx,foo\ny,foo\nx,bar\nx,foo\n"
+
+
+def run_filter(*args: str) -> str:
+    result = subprocess.run(
+        [sys.executable, str(FILTER), "-", *args],
+        input=ROWS,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout
+
+
+class ContainsWithCheaperPredicateTest(unittest.TestCase):
+    # --where a==x runs before --contains, so --contains only sees the rows still undecided.
+
+    def test_and(self) -> None:
+        self.assertEqual(run_filter("--where", "a==x", "--contains", "b:foo"), "a,b\nx,foo\nx,foo\n")
+
+    def test_or(self) -> None:
+        self.assertEqual(run_filter("--or", "--where", "a==y", "--contains", "b:bar"), "a,b\ny,foo\nx,bar\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -28,6 +28,17 @@ export function loadJson(path) {
   return JSON.parse(text);
 }
 
+export function parseNdjson(text) {
+  return text
+    .split("\n")
+    .filter((line) => line.trim())
+    .map((line) => JSON.parse(line));
+}
+
+export function loadNdjson(path) {
+  return parseNdjson(!path || path === "-" ? readStdin() : fs.readFileSync(path, "utf-8"));
+}
+
 function stableSortKeys(value) {
   if (Array.isArray(value)) {
     return value.map(stableSortKeys);
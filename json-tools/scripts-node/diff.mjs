@@ -49,13 +49,24 @@ function diffValues(left, right, path, changes, ignoreOrder) {
 
   if (Array.isArray(left)) {
     if (ignoreOrder) {
-      const leftSet = new Set(left.map((item) => JSON.stringify(normalizeForSet(item))));
-      const rightSet = new Set(right.map((item) => JSON.stringify(normalizeForSet(item))));
-      const sameSize = leftSet.size === rightSet.size;
-      const sameValues = [...leftSet].every((item) => rightSet.has(item));
-      if (!sameSize || !sameValues) {
-        changes.push({ path: path || "$", kind: "array_set_change", left, right });
-      }
+      // Compare as multisets and report each unmatched item, under its index on its own side.
+      const leftKeys = left.map((item) => JSON.stringify(normalizeForSet(item)));
+      const rightKeys = right.map((item) => JSON.stringify(normalizeForSet(item)));
+      const surplus = new Map();
+      for (const key of leftKeys) surplus.set(key, (surplus.get(key) || 0) + 1);
+      for (const key of rightKeys) surplus.set(key, (surplus.get(key) || 0) - 1);
+      leftKeys.forEach((key, idx) => {
+        if (surplus.get(key) > 0) {
+          surplus.set(key, surplus.get(key) - 1);
+          changes.push({ path: path ? `${path}[${idx}]` : `[${idx}]`, kind: "removed", left: left[idx] });
+        }
+      });
+      rightKeys.forEach((key, idx) => {
+        if (surplus.get(key) < 0) {
+          surplus.set(key, surplus.get(key) + 1);
+          changes.push({ path: path ? `${path}[${idx}]` : `[${idx}]`, kind: "added", right: right[idx] });
+        }
+      });
       return;
     }
 
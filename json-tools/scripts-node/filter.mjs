@@ -3,7 +3,7 @@
 // SPDX-License-Identifier: Apache-2.0
 
 import { parseArgs } from "node:util";
-import { existsPath, extractValues, loadJson, resolveArray, typeName, writeJson } from "./common.mjs";
+import { existsPath, extractValues, loadJson, loadNdjson, resolveArray, typeName, writeJson } from "./common.mjs";
 
 const EXPR_RE = /^(.+?)(==|!=|>=|<=|>|<)(.+)$/;
 const ALLOWED_TYPES = new Set(["string", "int", "float", "bool", "null", "array", "object"]);
@@ -137,16 +137,22 @@ function main() {
       contains: { type: "string", multiple: true, default: [] },
       regex: { type: "string", multiple: true, default: [] },
       or: { type: "boolean", default: false },
+      ndjson: { type: "boolean", default: false },
       compact: { type: "boolean", default: false },
     },
     allowPositionals: true,
   });
 
   const input = positionals[0] ?? "-";
-  const data = loadJson(input);
-  let rows = resolveArray(data, values["array-path"]);
-  if (!rows.length && !Array.isArray(data)) {
-    rows = [data];
+  let rows;
+  if (values.ndjson) {
+    rows = loadNdjson(input);
+  } else {
+    const data = loadJson(input);
+    rows = resolveArray(data, values["array-path"]);
+    if (!rows.length && !Array.isArray(data)) {
+      rows = [data];
+    }
   }
 
   const predicates = [];
@@ -4,7 +4,7 @@
 
 import fs from "node:fs";
 import { parseArgs } from "node:util";
-import { typeName, writeJson } from "./common.mjs";
+import { parseNdjson, typeName, writeJson } from "./common.mjs";
 
 function readText(path) {
   if (!path || path === "-") {
@@ -100,6 +100,7 @@ function main() {
   const { values, positionals } = parseArgs({
     options: {
       sample: { type: "string", default: "20" },
+      ndjson: { type: "boolean", default: false },
       compact: { type: "boolean", default: false },
     },
     allowPositionals: true,
@@ -112,13 +113,15 @@ function main() {
 
   let data;
   try {
-    data = JSON.parse(text);
+    data = values.ndjson ? parseNdjson(text) : JSON.parse(text);
   } catch (err) {
     writeJson({ valid: false, error: err instanceof Error ? err.message : String(err), size_bytes: sizeBytes }, values.compact);
     return;
   }
 
-  const info = detectLayout(data);
+  const info = values.ndjson
+    ? { layout: "ndjson", record_count: data.length, recommended_array_path: null, records: data }
+    : detectLayout(data);
   const records = info.records;
   delete info.records;
 
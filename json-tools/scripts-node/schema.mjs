@@ -31,17 +31,20 @@ function inferSchema(value, depth, includeCounts) {
     };
     if (value.length && depth > 0) {
       if (value.every((item) => item && typeof item === "object" && !Array.isArray(item))) {
+        // One pass over the records: the sample for a key is its value in the first record that has it.
         const keyCounts = new Map();
+        const samples = new Map();
         for (const item of value) {
-          for (const key of Object.keys(item)) {
+          for (const [key, inner] of Object.entries(item)) {
             keyCounts.set(key, (keyCounts.get(key) ?? 0) + 1);
+            if (!samples.has(key)) {
+              samples.set(key, inner);
+            }
           }
         }
         const mergedFields = {};
         for (const key of [...keyCounts.keys()].sort()) {
-          const samples = value.map((item) => item[key]).filter((sample) => sample !== undefined);
-          const sampleValue = samples.length ? samples[0] : null;
-          mergedFields[key] = inferSchema(sampleValue, depth - 1, includeCounts);
+          mergedFields[key] = inferSchema(samples.get(key), depth - 1, includeCounts);
           if (includeCounts) {
             mergedFields[key].presence = `${keyCounts.get(key)}/${value.length}`;
           }
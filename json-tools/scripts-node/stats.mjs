@@ -3,7 +3,7 @@
 // SPDX-License-Identifier: Apache-2.0
 
 import { parseArgs } from "node:util";
-import { extractValues, frequency, loadJson, resolveArray, uniqueTypes, writeJson } from "./common.mjs";
+import { extractValues, frequency, loadJson, loadNdjson, resolveArray, uniqueTypes, writeJson } from "./common.mjs";
 
 function parseFields(raw) {
   if (!raw) {
@@ -31,6 +31,7 @@ function main() {
       "array-path": { type: "string" },
       fields: { type: "string" },
       top: { type: "string", default: "10" },
+      ndjson: { type: "boolean", default: false },
       compact: { type: "boolean", default: false },
     },
     allowPositionals: true,
@@ -38,10 +39,15 @@ function main() {
 
   const input = positionals[0] ?? "-";
   const top = Number.parseInt(values.top, 10);
-  const data = loadJson(input);
-  let records = resolveArray(data, values["array-path"]);
-  if (!records.length) {
-    records = Array.isArray(data) ? data : [data];
+  let records;
+  if (values.ndjson) {
+    records = loadNdjson(input);
+  } else {
+    const data = loadJson(input);
+    records = resolveArray(data, values["array-path"]);
+    if (!records.length) {
+      records = Array.isArray(data) ? data : [data];
+    }
   }
 
   let selectedFields = parseFields(values.fields);
@@ -15,7 +15,7 @@ function readText(path) {
   return fs.readFileSync(path, "utf-8");
 }
 
-function analyze(text, strict) {
+function analyze(text, strict, summaryOnly) {
   const warnings = [];
   if (strict && TRAILING_COMMA_RE.test(text)) {
     warnings.push("Possible trailing comma detected.");
@@ -23,6 +23,9 @@ function analyze(text, strict) {
 
   try {
     const parsed = JSON.parse(text);
+    if (summaryOnly) {
+      return { valid: true, warnings };
+    }
     const result = {
       valid: true,
       top_level_type: typeName(parsed),
@@ -76,6 +79,7 @@ function main() {
   const { values, positionals } = parseArgs({
     options: {
       strict: { type: "boolean", default: false },
+      "summary-only": { type: "boolean", default: false },
       compact: { type: "boolean", default: false },
     },
     allowPositionals: true,
@@ -83,7 +87,7 @@ function main() {
 
   const input = positionals[0] ?? "-";
   const text = readText(input);
-  const result = analyze(text, values.strict);
+  const result = analyze(text, values.strict, values["summary-only"]);
   writeJson(result, values.compact);
 }
 
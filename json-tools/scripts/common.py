@@ -6,14 +6,41 @@
 
 from __future__ import annotations
 
+import io
 import json
+import mmap
+import os
 import re
+import stat
 import sys
 from collections import Counter
+from functools import lru_cache
+from itertools import islice
+from operator import methodcaller
 from pathlib import Path
-from typing import Any, Iterable, Iterator, List
+from typing import Any, Callable, Iterable, Iterator, List, Sequence
 
 PATH_TOKEN_RE = re.compile(r"([^.\[\]]+)|(\[(\*|\d+)\])")
+# Whitespace allowed between JSON tokens.
+_WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+
+# One decoder shared by the incremental readers: it holds no per-document state, so reusing it is safe.
+_DECODER = json.JSONDecoder()
+
+# Sentinel default for lookups where None is a real JSON value.
+_MISSING = object()
+
+# Encoder chunks joined per write when streaming indented JSON.
+JSON_WRITE_BATCH_CHUNKS = 65536
+
+# Records encoded per write by write_json_array.
+JSON_ARRAY_BATCH_ITEMS = 1024
+
+# Rows formatted in memory per write to the output stream.
+WRITE_BATCH_ROWS = 8192
+
+# Key-sorted JSON text of a value. One shared encoder: json.dumps() with options builds a new one per call.
+_canonical_encode = json.JSONEncoder(sort_keys=True, ensure_ascii=False).encode
 
 
 def load_json(path: str | None) -> Any:
@@ -25,19 +52,159 @@ def load_json(path: str | None) -> Any:
     return json.loads(text)
 
 
+def read_input(path: str | None) -> tuple[str, int]:
+    """
+    Text of the input (file newlines translated, as Path.read_text does) and the size of the input in
+    bytes, taken from the file or the raw bytes so the text never has to be encoded to be measured.
+    """
+    if not path or path == "-":
+        raw = sys.stdin.buffer.read()
+        return raw.decode("utf-8"), len(raw)
+    with open(path, "rb") as handle:
+        info = os.fstat(handle.fileno())
+        if stat.S_ISREG(info.st_mode) and info.st_size:
+            # A regular file is decoded straight from a read-only mapping, so no bytes copy of it is
+            # held on the heap next to the text.
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                text = str(mapped, "utf-8")
+            size_bytes = info.st_size
+        else:
+            raw = handle.read()
+            text = raw.decode("utf-8")
+            size_bytes = len(raw)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text, size_bytes
+
+
+def input_size(path: str | None) -> int | None:
+    """
+    Size in bytes of a regular file at path, from the filesystem; None for stdin, pipes and any other
+    input that has to be read to be measured.
+    """
+    if not path or path == "-":
+        return None
+    info = os.stat(path)
+    return info.st_size if stat.S_ISREG(info.st_mode) else None
+
+
+def iter_ndjson(
+    path: str | None,
+    text_override: str | None = None,
+    keep_line: Callable[[str], bool] | None = None,
+) -> Iterator[Any]:
+    """
+    Yield one parsed record per non-blank line of newline-delimited JSON (file path or stdin), reading
+    a line at a time. If text_override is provided, use it instead of reading from path.
+    If keep_line is set, lines it rejects are skipped without being parsed.
+    """
+    if text_override is not None:
+        stream: Any = io.StringIO(text_override)
+    elif not path or path == "-":
+        stream = sys.stdin
+    else:
+        stream = open(path, encoding="utf-8")
+    decode = _DECODER.decode
+    try:
+        lines: Iterable[str] = stream if keep_line is None else filter(keep_line, stream)
+        for line in lines:
+            if line.strip():
+                yield decode(line)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def iter_array_items(text: str) -> Iterator[Any]:
+    """
+    Yield the items of the top-level JSON array in text, decoding one item at a time so the whole tree
+    is never built. Raises json.JSONDecodeError, with the message and position json.loads would report,
+    once text turns out not to be a well-formed array; a plain ValueError where only json.loads can say
+    why (text is not an array, or an item is bad from its first character).
+    """
+    decode = _DECODER.raw_decode
+    skip = _WHITESPACE_RE.match
+    idx = skip(text).end()
+    if not text.startswith("[", idx):
+        raise ValueError("not a JSON array")
+    idx = skip(text, idx + 1).end()
+    if text.startswith("]", idx):
+        idx += 1
+    else:
+        while True:
+            try:
+                item, end = decode(text, idx)
+            except json.JSONDecodeError as err:
+                # An error inside an item comes from the same scanner json.loads runs; one at the item's
+                # start may read differently there (e.g. a trailing comma).
+                if err.pos == idx:
+                    raise ValueError("malformed JSON array") from err
+                raise
+            yield item
+            idx = skip(text, end).end()
+            if text.startswith(",", idx):
+                idx = skip(text, idx + 1).end()
+            elif text.startswith("]", idx):
+                idx += 1
+                break
+            else:
+                raise json.JSONDecodeError("Expecting ',' delimiter", text, idx)
+    end = skip(text, idx).end()
+    if end != len(text):
+        raise json.JSONDecodeError("Extra data", text, end)
+
+
 def write_json(data: Any, compact: bool = False) -> None:
     """Write JSON to stdout with deterministic formatting."""
     if compact:
-        json.dump(data, sys.stdout, ensure_ascii=False, separators=(",", ":"))
+        # dumps() encodes in one shot, which lets the compact path use the C encoder; dump() never does.
+        sys.stdout.write(json.dumps(data, ensure_ascii=False, separators=(",", ":")))
     else:
-        json.dump(data, sys.stdout, ensure_ascii=False, indent=2, sort_keys=True)
+        # Indented output is encoded in Python either way; write it in batches of chunks rather than
+        # joining every chunk at once (several times the output size) or writing each one separately.
+        chunks = json.JSONEncoder(ensure_ascii=False, indent=2, sort_keys=True).iterencode(data)
+        while True:
+            batch = list(islice(chunks, JSON_WRITE_BATCH_CHUNKS))
+            if not batch:
+                break
+            sys.stdout.write("".join(batch))
     sys.stdout.write("\n")
 
 
+def write_json_array(items: Iterable[Any], compact: bool = False) -> None:
+    """Write items as a JSON array while they are produced; same output as write_json(list(items))."""
+    if compact:
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    else:
+        encode = json.JSONEncoder(ensure_ascii=False, indent=2, sort_keys=True).encode
+    # Each batch is encoded as a small array and written without its brackets ("[" / "]", plus the
+    # newline next to each when indented), so the pieces join into the one array write_json would emit.
+    trim = 1 if compact else 2
+    items = iter(items)
+    sep = "[" if compact else "[\n"
+    while True:
+        batch = list(islice(items, JSON_ARRAY_BATCH_ITEMS))
+        if not batch:
+            break
+        sys.stdout.write(sep)
+        sys.stdout.write(encode(batch)[trim:-trim])
+        sep = "," if compact else ",\n"
+    if sep[0] == "[":
+        sys.stdout.write("[]\n")
+    else:
+        sys.stdout.write("]\n" if compact else "\n]\n")
+
+
 def parse_path(path: str) -> list[str | int]:
     """Parse dot path syntax with optional array indices and wildcards."""
+    return list(_path_tokens(path))
+
+
+@lru_cache(maxsize=256)
+def _path_tokens(path: str) -> tuple[str | int, ...]:
+    """Tokens of a path, memoized: the same few paths are resolved again for every record."""
     if not path:
-        return []
+        return ()
     tokens: list[str | int] = []
     for match in PATH_TOKEN_RE.finditer(path):
         key = match.group(1)
@@ -49,12 +216,16 @@ def parse_path(path: str) -> list[str | int]:
                 tokens.append("*")
             else:
                 tokens.append(int(bracket_token))
-    return tokens
+    return tuple(tokens)
 
 
 def extract_values(data: Any, path: str) -> list[Any]:
     """Extract all values matching path. Wildcards return multiple matches."""
-    tokens = parse_path(path)
+    return extract_tokens(data, _path_tokens(path))
+
+
+def extract_tokens(data: Any, tokens: Sequence[str | int]) -> list[Any]:
+    """Extract all values matching already-parsed path tokens (see parse_path)."""
     if not tokens:
         return [data]
     values: list[Any] = [data]
@@ -78,13 +249,96 @@ def extract_values(data: Any, path: str) -> list[Any]:
 
 def exists_path(data: Any, path: str) -> bool:
     """Return true when at least one value exists for path."""
-    return bool(extract_values(data, path))
+    return first_value(data, path, _MISSING) is not _MISSING
 
 
 def first_value(data: Any, path: str, default: Any = None) -> Any:
     """Get the first value matching path or default."""
-    values = extract_values(data, path)
-    return values[0] if values else default
+    tokens = _path_tokens(path)
+    if "*" in tokens:
+        # Stop at the first match instead of expanding every wildcard branch.
+        return next(_iter_tokens(data, tokens, 0), default)
+    return _walk_tokens(data, tokens, default)
+
+
+def first_values(items: Sequence[Any], path: str) -> list[Any]:
+    """[first_value(item, path) for item in items], resolved one path level at a time over the whole list."""
+    tokens = _path_tokens(path)
+    if "*" in tokens:
+        return [next(_iter_tokens(item, tokens, 0), None) for item in items]
+    values = list(items)
+    for token in tokens:
+        # None marks "missing" from here on: it is not a container, so deeper levels keep it None.
+        if isinstance(token, int):
+            values = [v[token] if isinstance(v, list) and -len(v) <= token < len(v) else None for v in values]
+        elif set(map(type, values)) == {dict}:
+            values = list(map(methodcaller("get", token), values))
+        else:
+            values = [v.get(token) if isinstance(v, dict) else None for v in values]
+    return values
+
+
+def values_getter(path: str) -> Callable[[Any], list[Any]]:
+    """Return a function equivalent to extract_values(data, path), with the path resolved once up front."""
+    tokens = _path_tokens(path)
+    if "*" in tokens:
+        return lambda data: extract_tokens(data, tokens)
+    if len(tokens) == 1 and isinstance(tokens[0], str):
+        # A top-level key (the common case) is one dict lookup, without the general path walk.
+        key = tokens[0]
+
+        def get_key(data: Any) -> list[Any]:
+            if isinstance(data, dict) and key in data:
+                return [data[key]]
+            return []
+
+        return get_key
+
+    def get(data: Any) -> list[Any]:
+        value = _walk_tokens(data, tokens, _MISSING)
+        return [] if value is _MISSING else [value]
+
+    return get
+
+
+def _walk_tokens(data: Any, tokens: Sequence[str | int], default: Any) -> Any:
+    """Value at a wildcard-free path, or default. At most one value can match: walk straight down."""
+    item = data
+    for token in tokens:
+        if isinstance(token, int):
+            if isinstance(item, list) and -len(item) <= token < len(item):
+                item = item[token]
+                continue
+        elif isinstance(item, dict) and token in item:
+            item = item[token]
+            continue
+        return default
+    return item
+
+
+def _iter_tokens(item: Any, tokens: Sequence[str | int], start: int) -> Iterator[Any]:
+    """Lazily yield the values matching tokens[start:] under item, in extract_tokens order."""
+    for pos in range(start, len(tokens)):
+        token = tokens[pos]
+        if token == "*":
+            if isinstance(item, list):
+                children: Iterable[Any] = item
+            elif isinstance(item, dict):
+                children = item.values()
+            else:
+                return
+            for child in children:
+                yield from _iter_tokens(child, tokens, pos + 1)
+            return
+        if isinstance(token, int):
+            if isinstance(item, list) and -len(item) <= token < len(item):
+                item = item[token]
+                continue
+        elif isinstance(item, dict) and token in item:
+            item = item[token]
+            continue
+        return
+    yield item
 
 
 def resolve_array(data: Any, array_path: str | None) -> list[Any]:
@@ -108,6 +362,7 @@ def flatten_json(data: Any, separator: str = ".", array_mode: str = "index") ->
     """Flatten nested JSON structure into key/value pairs."""
     output: dict[str, Any] = {}
 
+    # Scalar children are stored inline; walk() is only entered for nested containers.
     def walk(value: Any, prefix: str) -> None:
         if isinstance(value, dict):
             if not value and prefix:
@@ -115,7 +370,10 @@ def flatten_json(data: Any, separator: str = ".", array_mode: str = "index") ->
                 return
             for key, inner in value.items():
                 next_prefix = f"{prefix}{separator}{key}" if prefix else key
-                walk(inner, next_prefix)
+                if isinstance(inner, (dict, list)):
+                    walk(inner, next_prefix)
+                else:
+                    output[next_prefix] = inner
             return
         if isinstance(value, list):
             if array_mode == "ignore":
@@ -131,7 +389,10 @@ def flatten_json(data: Any, separator: str = ".", array_mode: str = "index") ->
                     next_prefix = prefix
                 else:
                     next_prefix = f"{prefix}[{idx}]" if prefix else f"[{idx}]"
-                walk(inner, next_prefix)
+                if isinstance(inner, (dict, list)):
+                    walk(inner, next_prefix)
+                else:
+                    output[next_prefix] = inner
             if not value and prefix:
                 output[prefix] = []
             return
@@ -141,8 +402,26 @@ def flatten_json(data: Any, separator: str = ".", array_mode: str = "index") ->
     return output
 
 
+# JSON-like type names of the exact types json.loads produces; type_name looks these up first.
+_TYPE_NAMES: dict[type, str] = {
+    type(None): "null",
+    bool: "bool",
+    int: "int",
+    float: "float",
+    str: "string",
+    list: "array",
+    dict: "object",
+}
+
+# Exact types of JSON numbers; an exact-type test also leaves out bool, which subclasses int.
+NUMERIC_TYPES = frozenset((int, float))
+
+
 def type_name(value: Any) -> str:
     """Map python value to a JSON-like type name."""
+    name = _TYPE_NAMES.get(type(value))
+    if name is not None:
+        return name
     if value is None:
         return "null"
     if isinstance(value, bool):
@@ -165,15 +444,28 @@ def unique_types(values: Iterable[Any]) -> list[str]:
     return sorted({type_name(v) for v in values})
 
 
+def dedup_key(value: Any) -> Any:
+    """
+    Hashable identity of a JSON value for de-duplication: equal exactly when repr() is, but scalars
+    are keyed by (type, value) instead of building a repr string for each one.
+    """
+    kind = type(value)
+    if kind is float:
+        # NaN != NaN and -0.0 == 0.0, so those two are keyed by repr.
+        return (kind, value) if value == value and value else (kind, repr(value))
+    if kind is dict or kind is list:
+        return (kind, repr(value))
+    return (kind, value)
+
+
 def frequency(values: Iterable[Any]) -> Counter:
     """Build frequency counter for hashable representations."""
-    normalized: list[str] = []
-    for value in values:
-        if isinstance(value, (dict, list)):
-            normalized.append(json.dumps(value, sort_keys=True, ensure_ascii=False))
-        else:
-            normalized.append(str(value))
-    return Counter(normalized)
+    values = list(values)
+    if not set(map(type, values)) & {dict, list}:
+        return Counter(map(str, values))
+    return Counter(
+        _canonical_encode(value) if isinstance(value, (dict, list)) else str(value) for value in values
+    )
 
 
 def parse_literal(value: str) -> Any:
@@ -7,17 +7,15 @@
 from __future__ import annotations
 
 import argparse
+import json
+from collections import Counter
 from typing import Any
 
 from common import load_json, type_name, write_json
 
 
-def normalize_for_set(value: Any) -> Any:
-    if isinstance(value, dict):
-        return tuple(sorted((k, normalize_for_set(v)) for k, v in value.items()))
-    if isinstance(value, list):
-        return tuple(normalize_for_set(v) for v in value)
-    return value
+# Canonical JSON text of an array item for --ignore-order: the C encoder does the recursive work.
+canonical_json = json.JSONEncoder(ensure_ascii=False, sort_keys=True).encode
 
 
 def diff_values(left: Any, right: Any, path: str, changes: list[dict[str, Any]], ignore_order: bool) -> None:
@@ -35,27 +33,42 @@ def diff_values(left: Any, right: Any, path: str, changes: list[dict[str, Any]],
         return
 
     if isinstance(left, dict):
-        left_keys = set(left.keys())
-        right_keys = set(right.keys())
-        for key in sorted(left_keys - right_keys):
-            changes.append({"path": f"{path}.{key}" if path else key, "kind": "removed", "left": left[key]})
-        for key in sorted(right_keys - left_keys):
-            changes.append({"path": f"{path}.{key}" if path else key, "kind": "added", "right": right[key]})
-        for key in sorted(left_keys & right_keys):
-            child_path = f"{path}.{key}" if path else key
-            diff_values(left[key], right[key], child_path, changes, ignore_order)
+        # Membership tests against the dicts themselves; no key sets are built.
+        left_sorted = sorted(left)
+        for key in left_sorted:
+            if key not in right:
+                changes.append({"path": f"{path}.{key}" if path else key, "kind": "removed", "left": left[key]})
+        for key in sorted(right):
+            if key not in left:
+                changes.append({"path": f"{path}.{key}" if path else key, "kind": "added", "right": right[key]})
+        for key in left_sorted:
+            if key in right:
+                diff_child(left[key], right[key], f"{path}.{key}" if path else key, changes, ignore_order)
         return
 
     if isinstance(left, list):
         if ignore_order:
-            left_set = {normalize_for_set(item) for item in left}
-            right_set = {normalize_for_set(item) for item in right}
-            if left_set != right_set:
-                changes.append({"path": path or "$", "kind": "array_set_change", "left": left, "right": right})
+            # Compare as multisets and report each unmatched item, under its index on its own side.
+            left_keys = list(map(canonical_json, left))
+            right_keys = list(map(canonical_json, right))
+            left_counts = Counter(left_keys)
+            right_counts = Counter(right_keys)
+            if left_counts == right_counts:
+                return
+            removed = left_counts - right_counts
+            added = right_counts - left_counts
+            for idx, key in enumerate(left_keys):
+                if removed[key]:
+                    removed[key] -= 1
+                    changes.append({"path": f"{path}[{idx}]" if path else f"[{idx}]", "kind": "removed", "left": left[idx]})
+            for idx, key in enumerate(right_keys):
+                if added[key]:
+                    added[key] -= 1
+                    changes.append({"path": f"{path}[{idx}]" if path else f"[{idx}]", "kind": "added", "right": right[idx]})
             return
         min_len = min(len(left), len(right))
         for idx in range(min_len):
-            diff_values(left[idx], right[idx], f"{path}[{idx}]" if path else f"[{idx}]", changes, ignore_order)
+            diff_child(left[idx], right[idx], f"{path}[{idx}]" if path else f"[{idx}]", changes, ignore_order)
         if len(left) > len(right):
             for idx in range(min_len, len(left)):
                 changes.append({"path": f"{path}[{idx}]" if path else f"[{idx}]", "kind": "removed", "left": left[idx]})
@@ -68,6 +81,15 @@ def diff_values(left: Any, right: Any, path: str, changes: list[dict[str, Any]],
         changes.append({"path": path or "$", "kind": "changed", "left": left, "right": right})
 
 
+def diff_child(left: Any, right: Any, path: str, changes: list[dict[str, Any]], ignore_order: bool) -> None:
+    """diff_values for a child; equal-typed scalars (most nodes) are compared here without recursing."""
+    if type(left) is type(right) and not isinstance(left, (dict, list)):
+        if left != right:
+            changes.append({"path": path or "$", "kind": "changed", "left": left, "right": right})
+        return
+    diff_values(left, right, path, changes, ignore_order)
+
+
 def to_text(changes: list[dict[str, Any]]) -> str:
     if not changes:
         return "No differences.\n"
@@ -93,7 +115,7 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="Diff two JSON files.")
     parser.add_argument("left", help="Left JSON file.")
     parser.add_argument("right", help="Right JSON file.")
-    parser.add_argument("--ignore-order", action="store_true", help="Treat arrays as unordered sets.")
+    parser.add_argument("--ignore-order", action="store_true", help="Compare arrays ignoring element order; unmatched items are reported as added/removed.")
     parser.add_argument("--format", choices=["json", "text"], default="json", help="Output format.")
     parser.add_argument("--compact", action="store_true", help="Emit compact JSON output.")
     args = parser.parse_args()
@@ -9,7 +9,7 @@ from __future__ import annotations
 import argparse
 from typing import Any
 
-from common import extract_values, first_value, load_json, resolve_array, write_json
+from common import extract_tokens, load_json, parse_path, resolve_array, write_json
 
 
 def parse_fields(raw: str | None) -> list[str]:
@@ -28,14 +28,16 @@ def select_rows(data: Any, array_path: str | None, first: int | None, last: int
 
 
 def extract_fields(rows: list[Any], fields: list[str], include_missing: bool) -> list[dict[str, Any]]:
+    # Parse each field path once, not once per row.
+    field_tokens = [(field, parse_path(field)) for field in fields]
     output: list[dict[str, Any]] = []
     for row in rows:
         if not isinstance(row, dict):
             output.append({"_value": row})
             continue
         item: dict[str, Any] = {}
-        for field in fields:
-            values = extract_values(row, field)
+        for field, tokens in field_tokens:
+            values = extract_tokens(row, tokens)
             if values:
                 item[field] = values if len(values) > 1 else values[0]
             elif include_missing:
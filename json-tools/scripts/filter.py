@@ -7,11 +7,23 @@
 from __future__ import annotations
 
 import argparse
+import math
 import operator
 import re
-from typing import Any, Callable
-
-from common import exists_path, extract_values, first_value, load_json, resolve_array, type_name, write_json
+import time
+from itertools import chain, islice
+from typing import Any, Callable, Iterable, List, Tuple
+
+from common import (
+    first_value,
+    iter_ndjson,
+    load_json,
+    parse_path,
+    resolve_array,
+    type_name,
+    values_getter,
+    write_json_array,
+)
 
 OPS: dict[str, Callable[[Any, Any], bool]] = {
     "==": operator.eq,
@@ -23,7 +35,11 @@ OPS: dict[str, Callable[[Any, Any], bool]] = {
 }
 
 EXPR_RE = re.compile(r"^(.+?)(==|!=|>=|<=|>|<)(.+)$")
+# Characters with a special meaning in a regex; patterns without them are matched as plain strings.
+REGEX_META = frozenset(".^$*+?{}[]\\|()")
 ALLOWED_TYPES = {"string", "int", "float", "bool", "null", "array", "object"}
+# Leading rows used to time the predicates and decide the order they run in.
+PLAN_SAMPLE_ROWS = 256
 
 
 def parse_rhs(raw: str) -> Any:
@@ -43,17 +59,19 @@ def parse_rhs(raw: str) -> Any:
         return text.strip('"').strip("'")
 
 
-def compare_condition(expr: str) -> Callable[[Any], bool]:
+# A condition is a field path plus a test on the values found at that path in a record.
+Condition = Tuple[str, Callable[[List[Any]], bool]]
+
+
+def compare_condition(expr: str) -> Condition:
     match = EXPR_RE.match(expr.strip())
     if not match:
         raise ValueError(f"Invalid --where expression: {expr}")
     field, op, rhs = match.groups()
-    field = field.strip()
     rhs_value = parse_rhs(rhs)
     comparator = OPS[op]
 
-    def predicate(record: Any) -> bool:
-        values = extract_values(record, field)
+    def test(values: list[Any]) -> bool:
         for value in values:
             try:
                 if comparator(value, rhs_value):
@@ -62,67 +80,203 @@ def compare_condition(expr: str) -> Callable[[Any], bool]:
                 continue
         return False
 
-    return predicate
+    return field.strip(), test
 
 
-def type_condition(spec: str) -> Callable[[Any], bool]:
+def type_condition(spec: str) -> Condition:
     if "=" not in spec:
         raise ValueError("--type must use field=typename syntax")
     field, expected = spec.split("=", 1)
-    field = field.strip()
     expected = expected.strip()
     if expected not in ALLOWED_TYPES:
         raise ValueError(f"Unsupported type '{expected}'. Use one of: {sorted(ALLOWED_TYPES)}")
 
-    def predicate(record: Any) -> bool:
-        values = extract_values(record, field)
+    def test(values: list[Any]) -> bool:
         return any(type_name(value) == expected for value in values)
 
-    return predicate
-
+    return field.strip(), test
 
-def exists_condition(path: str, invert: bool = False) -> Callable[[Any], bool]:
-    def predicate(record: Any) -> bool:
-        result = exists_path(record, path.strip())
-        return not result if invert else result
 
-    return predicate
+def exists_condition(path: str, invert: bool = False) -> Condition:
+    # A path exists when it matches at least one value.
+    if invert:
+        return path.strip(), operator.not_
+    return path.strip(), bool
 
 
-def contains_condition(spec: str) -> Callable[[Any], bool]:
+def contains_condition(spec: str) -> Condition:
     if ":" not in spec:
         raise ValueError("--contains must be field:substring")
     field, substring = spec.split(":", 1)
-    field = field.strip()
 
-    def predicate(record: Any) -> bool:
-        values = extract_values(record, field)
+    def test(values: list[Any]) -> bool:
         for value in values:
             if isinstance(value, str) and substring in value:
                 return True
         return False
 
-    return predicate
-
-
-def regex_condition(spec: str) -> Callable[[Any], bool]:
+    return field.strip(), test
+
+
+def literal_matcher(pattern: str) -> Callable[[str], bool] | None:
+    """
+    Plain string test equivalent to re.search(pattern, value) for anchored literal patterns
+    ("^abc", "abc$", "^abc$") and ".*" / ".+"; None when the regex engine is needed.
+    """
+    if pattern in ("", ".*"):
+        return lambda value: True
+    if pattern == ".+":
+        # "." matches anything but a newline.
+        return lambda value: bool(value.strip("\n"))
+    start = pattern.startswith("^")
+    end = pattern.endswith("$") and not pattern.endswith("\\$")
+    literal = pattern[1 if start else 0 : -1 if end else None]
+    if not literal or any(ch in REGEX_META for ch in literal):
+        return None
+    # "$" also matches just before a final newline.
+    if start and end:
+        with_newline = literal + "\n"
+        return lambda value: value == literal or value == with_newline
+    if start:
+        return lambda value: value.startswith(literal)
+    if end:
+        suffixes = (literal, literal + "\n")
+        return lambda value: value.endswith(suffixes)
+    # An unanchored literal is left to the regex engine, whose literal search is already as fast as "in".
+    return None
+
+
+def regex_condition(spec: str) -> Condition:
     if ":" not in spec:
         raise ValueError("--regex must be field:pattern")
     field, pattern = spec.split(":", 1)
-    field = field.strip()
     try:
         compiled = re.compile(pattern)
     except re.error as e:
         raise ValueError(f"Invalid --regex pattern: {e}") from e
+    matches = literal_matcher(pattern) or compiled.search
 
-    def predicate(record: Any) -> bool:
-        values = extract_values(record, field)
+    def test(values: list[Any]) -> bool:
         for value in values:
-            if isinstance(value, str) and compiled.search(value):
+            if isinstance(value, str) and matches(value):
                 return True
         return False
 
-    return predicate
+    return field.strip(), test
+
+
+def field_predicates(conditions: list[Condition], use_or: bool) -> list[Callable[[Any], bool]]:
+    """
+    One record predicate per distinct field path, in order of first use: the path's values are
+    extracted once per record and shared by every test on it (all of them for AND, any for OR).
+    """
+    tests_by_field: dict[str, list[Callable[[list[Any]], bool]]] = {}
+    for field, test in conditions:
+        tests_by_field.setdefault(field, []).append(test)
+    return [field_predicate(values_getter(field), tests, use_or) for field, tests in tests_by_field.items()]
+
+
+def field_predicate(
+    values_of: Callable[[Any], list[Any]],
+    tests: list[Callable[[list[Any]], bool]],
+    use_or: bool,
+) -> Callable[[Any], bool]:
+    if len(tests) == 1:
+        test = tests[0]
+
+        def predicate(record: Any) -> bool:
+            return test(values_of(record))
+
+        return predicate
+
+    if use_or:
+
+        def any_test(record: Any) -> bool:
+            values = values_of(record)
+            for test in tests:
+                if test(values):
+                    return True
+            return False
+
+        return any_test
+
+    def all_tests(record: Any) -> bool:
+        values = values_of(record)
+        for test in tests:
+            if not test(values):
+                return False
+        return True
+
+    return all_tests
+
+
+def text_needle(text: str, quoted: bool = False) -> str | None:
+    """
+    How text must appear in a raw NDJSON line that holds it as a string (wrapped in quotes if quoted);
+    None when JSON could spell it more than one way.
+    """
+    if not text or any(ch in '"\\' or ch < " " for ch in text):
+        return None
+    return f'"{text}"' if quoted else text
+
+
+def where_needle(expr: str) -> str | None:
+    """Text every line matching a field==string --where must contain."""
+    match = EXPR_RE.match(expr.strip())
+    if not match or match.group(2) != "==":
+        return None
+    rhs_value = parse_rhs(match.group(3))
+    # Numbers, booleans and null compare equal across spellings (1 == 1.0 == true), so only strings qualify.
+    return text_needle(rhs_value, quoted=True) if isinstance(rhs_value, str) else None
+
+
+def exists_needle(path: str) -> str | None:
+    """Text every line where path exists must contain: its last object key, quoted."""
+    keys = [token for token in parse_path(path.strip()) if isinstance(token, str) and token != "*"]
+    return text_needle(keys[-1], quoted=True) if keys else None
+
+
+def contains_needle(spec: str) -> str | None:
+    """Text every line matching a --contains must contain: the substring itself."""
+    return text_needle(spec.split(":", 1)[1]) if ":" in spec else None
+
+
+def line_screen(needles: list[str | None], use_or: bool) -> Callable[[str], bool] | None:
+    """
+    Cheap test on raw NDJSON lines that only rejects lines no record could match: a line must hold the
+    needle of every predicate (AND) or of any predicate (OR). Lines with a backslash escape are always
+    kept, since there a string may be spelled differently. None when no predicate has a needle.
+    """
+    if use_or:
+        if not needles or None in needles:
+            return None
+        any_needles = list(needles)
+        return lambda line: "\\" in line or any(needle in line for needle in any_needles)
+    required = [needle for needle in needles if needle is not None]
+    if not required:
+        return None
+    return lambda line: "\\" in line or all(needle in line for needle in required)
+
+
+def order_predicates(
+    predicates: list[Callable[[Any], bool]],
+    sample: list[Any],
+    use_or: bool,
+) -> list[Callable[[Any], bool]]:
+    """
+    Reorder predicates by their measured cost on sample rows per row they decide (reject for AND,
+    accept for OR), cheapest first; predicates are pure, so the filter result does not change.
+    """
+    if len(predicates) < 2 or not sample:
+        return predicates
+    ranks: list[float] = []
+    for pred in predicates:
+        start = time.perf_counter()
+        hits = sum(1 for row in sample if pred(row))
+        cost = time.perf_counter() - start
+        decided = hits if use_or else len(sample) - hits
+        ranks.append(cost / decided if decided else math.inf)
+    return [predicates[idx] for idx in sorted(range(len(predicates)), key=ranks.__getitem__)]
 
 
 def main() -> None:
@@ -136,37 +290,67 @@ def main() -> None:
     parser.add_argument("--contains", action="append", default=[], help="Field:substring — keep records where any string value contains substring.")
     parser.add_argument("--regex", action="append", default=[], help="Field:pattern — keep records where any string value matches regex.")
     parser.add_argument("--or", dest="use_or", action="store_true", help="Use OR logic instead of AND.")
+    parser.add_argument("--ndjson", action="store_true", help="Input is newline-delimited JSON (one record per line); records are streamed and lines that cannot match are skipped unparsed.")
     parser.add_argument("--compact", action="store_true", help="Emit compact JSON output.")
     args = parser.parse_args()
 
-    data = load_json(args.input)
-    rows = resolve_array(data, args.array_path)
-    if not rows and not isinstance(data, list):
-        rows = [data]
+    rows: Iterable[Any] = []
+    if not args.ndjson:
+        data = load_json(args.input)
+        rows = resolve_array(data, args.array_path)
+        if not rows and not isinstance(data, list):
+            rows = [data]
 
-    predicates: list[Callable[[Any], bool]] = []
+    conditions: list[Condition] = []
+    # Per condition, text a raw NDJSON line must contain for it to match (None: no such text).
+    needles: list[str | None] = []
     for expr in args.where:
-        predicates.append(compare_condition(expr))
+        conditions.append(compare_condition(expr))
+        needles.append(where_needle(expr))
     for path in args.exists:
-        predicates.append(exists_condition(path, invert=False))
+        conditions.append(exists_condition(path, invert=False))
+        needles.append(exists_needle(path))
     for path in args.not_exists:
-        predicates.append(exists_condition(path, invert=True))
+        conditions.append(exists_condition(path, invert=True))
+        needles.append(None)
     for spec in args.type:
-        predicates.append(type_condition(spec))
+        conditions.append(type_condition(spec))
+        needles.append(None)
     for spec in args.contains:
-        predicates.append(contains_condition(spec))
+        conditions.append(contains_condition(spec))
+        needles.append(contains_needle(spec))
     for spec in args.regex:
-        predicates.append(regex_condition(spec))
+        conditions.append(regex_condition(spec))
+        needles.append(None)
+    predicates = field_predicates(conditions, args.use_or)
+
+    if args.ndjson:
+        # Lines that cannot match are dropped before json parsing; the predicates still check the rest.
+        rows = iter_ndjson(args.input, keep_line=line_screen(needles, args.use_or))
 
     if not predicates:
-        write_json(rows, compact=args.compact)
+        write_json_array(rows, compact=args.compact)
         return
 
-    if args.use_or:
-        filtered = [row for row in rows if any(pred(row) for pred in predicates)]
+    if isinstance(rows, list):
+        sample = rows[:PLAN_SAMPLE_ROWS]
+    else:
+        sample = list(islice(rows, PLAN_SAMPLE_ROWS))
+        rows = chain(sample, rows)
+    predicates = order_predicates(predicates, sample, args.use_or)
+
+    kept: Iterable[Any]
+    if args.use_or and len(predicates) > 1:
+        kept = (row for row in rows if any(pred(row) for pred in predicates))
     else:
-        filtered = [row for row in rows if all(pred(row) for pred in predicates)]
-    write_json(filtered, compact=args.compact)
+        # AND as a chain of filter() calls: each predicate only sees the rows the ones before it kept,
+        # and no per-row generator is built.
+        kept = rows
+        for pred in predicates:
+            kept = filter(pred, kept)
+    # Matches are encoded and written in batches as they are found: neither a list of matches nor the
+    # whole output text is built, and with --ndjson only one batch of records is held at a time.
+    write_json_array(kept, compact=args.compact)
 
 
 if __name__ == "__main__":
@@ -7,10 +7,15 @@
 from __future__ import annotations
 
 import argparse
-from collections import defaultdict
+import heapq
+import json
+from collections import Counter, defaultdict
 from typing import Any
 
-from common import first_value, load_json, resolve_array, write_json
+from common import NUMERIC_TYPES, dedup_key, first_values, load_json, resolve_array, write_json
+
+# Compact key-sorted JSON text, from one shared encoder rather than a json.dumps() call per value.
+canonical_json = json.JSONEncoder(sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode
 
 
 def parse_fields(raw: str) -> list[str]:
@@ -31,17 +36,11 @@ def parse_agg(spec: str) -> tuple[str, str]:
     return (field.strip(), func)
 
 
-def group_key(record: Any, by_fields: list[str]) -> tuple[Any, ...]:
-    """Build a hashable group key from the record."""
-    parts: list[Any] = []
-    for field in by_fields:
-        value = first_value(record, field)
-        # Make lists/dicts hashable for grouping.
-        if isinstance(value, (dict, list)):
-            import json
-            value = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
-        parts.append(value)
-    return tuple(parts)
+def hashable_column(values: list[Any]) -> list[Any]:
+    """Group-by values as hashable keys: lists/dicts become their canonical JSON text."""
+    if not set(map(type, values)) & {dict, list}:
+        return values
+    return [canonical_json(value) if isinstance(value, (dict, list)) else value for value in values]
 
 
 def compute_agg(values: list[Any], func: str) -> Any:
@@ -52,16 +51,16 @@ def compute_agg(values: list[Any], func: str) -> Any:
         return values
     if func == "unique":
         seen: list[Any] = []
-        seen_set: set[str] = set()
+        seen_set: set[Any] = set()
         for v in values:
-            token = repr(v)
+            token = dedup_key(v)
             if token not in seen_set:
                 seen_set.add(token)
                 seen.append(v)
         return seen
 
     # Numeric aggregations — preserve int where possible.
-    nums = [v for v in values if isinstance(v, (int, float)) and not isinstance(v, bool)]
+    nums = [v for v in values if type(v) in NUMERIC_TYPES]
     if not nums:
         return None
     if func == "sum":
@@ -75,6 +74,10 @@ def compute_agg(values: list[Any], func: str) -> Any:
     return None
 
 
+def group_sort_key(key: tuple[Any, ...]) -> tuple[Any, ...]:
+    return tuple(v or "" for v in key)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Group-by / cross-tabulation for JSON records.")
     parser.add_argument("input", nargs="?", default="-", help="Input JSON file path or '-' for stdin.")
@@ -99,44 +102,58 @@ def main() -> None:
     if not records:
         records = data if isinstance(data, list) else [data]
 
-    # Group records.
-    groups: dict[tuple[Any, ...], list[Any]] = defaultdict(list)
-    for record in records:
-        key = group_key(record, by_fields)
-        groups[key].append(record)
+    # Key and aggregation values are read one column (field) at a time over all records.
+    key_columns = [hashable_column(first_values(records, field)) for field in by_fields]
+    keys = list(zip(*key_columns)) if by_fields else [()] * len(records)
+    value_aggs = [(field, func) for field, func in agg_specs if field or func != "count"]
+    members: dict[tuple[Any, ...], list[int]] = {}
+    if not value_aggs:
+        # Count-only: Counter tallies keys in C (first-seen order); no per-group record lists.
+        counts = Counter(keys)
+    else:
+        members = defaultdict(list)
+        for i, key in enumerate(keys):
+            members[key].append(i)
+        counts = Counter({key: len(idx) for key, idx in members.items()})
+    uniques = list(counts)
+
+    # Order (and trim to --top) the groups first, so aggregations run only for emitted groups.
+    order: list[tuple[Any, ...]]
+    trim = args.top is not None and args.top < len(uniques)
+    if args.sort == "count":
+        if trim:
+            # nlargest is stable like sort(reverse=True), but O(G log N) instead of O(G log G).
+            order = heapq.nlargest(max(args.top, 0), uniques, key=counts.__getitem__)
+        else:
+            order = sorted(uniques, key=counts.__getitem__, reverse=True)
+    else:
+        if trim:
+            # Likewise nsmallest for the first N groups by key.
+            order = heapq.nsmallest(max(args.top, 0), uniques, key=group_sort_key)
+        else:
+            order = sorted(uniques, key=group_sort_key)
+    if args.top is not None:
+        order = order[: max(args.top, 0)]
+
+    agg_columns = {field: first_values(records, field) for field, _ in value_aggs}
 
     # Build output rows.
     rows: list[dict[str, Any]] = []
-    for key_tuple, group_records in groups.items():
+    for key_tuple in order:
         row: dict[str, Any] = {}
         for field, value in zip(by_fields, key_tuple):
             row[field] = value
-        row["count"] = len(group_records)
-        for agg_field, agg_func in agg_specs:
-            if agg_field == "" and agg_func == "count":
-                continue  # Already included as 'count'.
-            values: list[Any] = []
-            for record in group_records:
-                v = first_value(record, agg_field)
-                if v is not None:
-                    values.append(v)
+        row["count"] = counts[key_tuple]
+        for agg_field, agg_func in value_aggs:
+            column = agg_columns[agg_field]
+            values = [v for v in map(column.__getitem__, members[key_tuple]) if v is not None]
             label = f"{agg_field}:{agg_func}"
             row[label] = compute_agg(values, agg_func)
         rows.append(row)
 
-    # Sort.
-    if args.sort == "count":
-        rows.sort(key=lambda r: r["count"], reverse=True)
-    else:
-        rows.sort(key=lambda r: tuple(r.get(f) or "" for f in by_fields))
-
-    # Limit.
-    if args.top is not None:
-        rows = rows[: max(args.top, 0)]
-
     result = {
         "total_records": len(records),
-        "total_groups": len(groups),
+        "total_groups": len(uniques),
         "groups": rows,
     }
     write_json(result, compact=args.compact)
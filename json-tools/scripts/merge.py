@@ -7,10 +7,9 @@
 from __future__ import annotations
 
 import argparse
-import copy
 from typing import Any
 
-from common import first_value, load_json, write_json
+from common import dedup_key, first_value, load_json, write_json
 
 
 def shallow_merge(objs: list[dict[str, Any]]) -> dict[str, Any]:
@@ -21,17 +20,19 @@ def shallow_merge(objs: list[dict[str, Any]]) -> dict[str, Any]:
 
 
 def deep_merge_values(left: Any, right: Any) -> Any:
+    # Merging never mutates its inputs (merged objects and arrays are new), so values taken from
+    # the right-hand side are shared rather than deep-copied.
     if isinstance(left, dict) and isinstance(right, dict):
         merged = dict(left)
         for key, value in right.items():
             if key in merged:
                 merged[key] = deep_merge_values(merged[key], value)
             else:
-                merged[key] = copy.deepcopy(value)
+                merged[key] = value
         return merged
     if isinstance(left, list) and isinstance(right, list):
         return left + right
-    return copy.deepcopy(right)
+    return right
 
 
 def merge_arrays(arrays: list[list[Any]], unique_by: str | None) -> list[Any]:
@@ -40,11 +41,11 @@ def merge_arrays(arrays: list[list[Any]], unique_by: str | None) -> list[Any]:
         combined.extend(arr)
     if not unique_by:
         return combined
-    seen: set[str] = set()
+    seen: set[Any] = set()
     deduped: list[Any] = []
     for item in combined:
         key = first_value(item, unique_by)
-        token = repr(key)
+        token = dedup_key(key)
         if token in seen:
             continue
         seen.add(token)
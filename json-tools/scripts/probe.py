@@ -8,17 +8,46 @@ from __future__ import annotations
 
 import argparse
 import json
-import sys
-from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
-from common import type_name, write_json
+from common import input_size, iter_array_items, iter_ndjson, read_input, type_name, write_json
 
 
-def read_text(path: str | None) -> str:
-    if not path or path == "-":
-        return sys.stdin.read()
-    return Path(path).read_text(encoding="utf-8")
+def scan_top_level_array(text: str, sample: int) -> tuple[int, list[Any]] | None:
+    """
+    Count the items of a top-level JSON array, decoding one item at a time so the whole tree is never
+    built. Items are kept up to the sample-th object (all that field discovery looks at).
+    Returns None when text is not a well-formed array; json.loads then decides and reports why.
+    """
+    count = 0
+    kept: list[Any] = []
+    objects = 0
+    wanted = max(sample, 1)
+    try:
+        for item in iter_array_items(text):
+            count += 1
+            if objects < wanted:
+                kept.append(item)
+                if isinstance(item, dict):
+                    objects += 1
+    except ValueError:
+        return None
+    return count, kept
+
+
+def scan_ndjson(records: Iterable[Any], sample: int) -> tuple[int, list[Any]]:
+    """Count newline-delimited records as they are parsed, keeping the sample (as scan_top_level_array)."""
+    count = 0
+    kept: list[Any] = []
+    objects = 0
+    wanted = max(sample, 1)
+    for item in records:
+        count += 1
+        if objects < wanted:
+            kept.append(item)
+            if isinstance(item, dict):
+                objects += 1
+    return count, kept
 
 
 def collect_record_fields(records: list[Any], sample: int) -> list[str]:
@@ -105,20 +134,41 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="Quick structural probe of a JSON file.")
     parser.add_argument("input", nargs="?", default="-", help="Input JSON file path or '-' for stdin.")
     parser.add_argument("--sample", type=int, default=20, help="Number of records to sample for field discovery.")
+    parser.add_argument("--ndjson", action="store_true", help="Input is newline-delimited JSON (one record per line).")
     parser.add_argument("--compact", action="store_true", help="Emit compact JSON output.")
     args = parser.parse_args()
 
-    text = read_text(args.input)
-    size_bytes = len(text.encode("utf-8"))
-
-    try:
-        data = json.loads(text)
-    except json.JSONDecodeError as err:
-        write_json({"valid": False, "error": err.msg, "size_bytes": size_bytes}, compact=args.compact)
-        return
-
-    info = detect_layout(data)
-    records = info.pop("records")
+    # NDJSON from a regular file is streamed from path; anything else is read once, here.
+    text: str | None = None
+    size_bytes = input_size(args.input) if args.ndjson else None
+    if size_bytes is None:
+        text, size_bytes = read_input(args.input)
+
+    # A top-level array (the common big-file layout) only needs its length and a sample of records.
+    scanned = None if text is None or args.ndjson else scan_top_level_array(text, args.sample)
+    data: Any
+    info: dict[str, Any]
+    if args.ndjson:
+        # Every line is parsed (and so validated), with one record in memory at a time.
+        try:
+            record_count, records = scan_ndjson(iter_ndjson(args.input, text_override=text), args.sample)
+        except json.JSONDecodeError as err:
+            write_json({"valid": False, "error": err.msg, "size_bytes": size_bytes}, compact=args.compact)
+            return
+        data = records
+        info = {"layout": "ndjson", "record_count": record_count, "recommended_array_path": None}
+    elif scanned is not None:
+        record_count, records = scanned
+        data = records
+        info = {"layout": "array", "record_count": record_count, "recommended_array_path": None}
+    else:
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as err:
+            write_json({"valid": False, "error": err.msg, "size_bytes": size_bytes}, compact=args.compact)
+            return
+        info = detect_layout(data)
+        records = info.pop("records")
 
     result: dict[str, Any] = {
         "valid": True,
@@ -138,14 +188,19 @@ def main() -> None:
 
     # Type summary for each field from sampled records.
     if result["record_fields"]:
+        # The sampled records are the ones record_fields came from, so each of their keys is listed.
+        rank = {field: idx for idx, field in enumerate(result["record_fields"])}
         field_types: dict[str, set[str]] = {}
         inspected = 0
         for record in records:
             if not isinstance(record, dict):
                 continue
-            for field in result["record_fields"]:
-                if field in record:
-                    field_types.setdefault(field, set()).add(type_name(record[field]))
+            if not record.keys() <= field_types.keys():
+                # Fields are reported in the order first seen, and in record_fields order within a record.
+                for field in sorted(record.keys() - field_types.keys(), key=rank.__getitem__):
+                    field_types[field] = set()
+            for field, value in record.items():
+                field_types[field].add(type_name(value))
             inspected += 1
             if inspected >= args.sample:
                 break
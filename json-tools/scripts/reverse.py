@@ -24,8 +24,9 @@ def main() -> None:
     if not rows:
         rows = data if isinstance(data, list) else [data]
 
-    reversed_rows = list(reversed(rows))
-    write_json(reversed_rows, compact=args.compact)
+    # rows is always a list owned by this process, so it is reversed in place rather than copied.
+    rows.reverse()
+    write_json(rows, compact=args.compact)
 
 
 if __name__ == "__main__":
@@ -35,15 +35,18 @@ def infer_schema(value: Any, depth: int, include_counts: bool) -> dict[str, Any]
         }
         if value and depth > 0:
             if all(isinstance(item, dict) for item in value):
-                # Merge object keys for heterogeneous records.
-                key_counts = Counter()
+                # Merge object keys for heterogeneous records, in one pass over them: the sample for
+                # a key is its value in the first record that has it.
+                key_counts: Counter = Counter()
+                samples: dict[str, Any] = {}
                 for item in value:
                     key_counts.update(item.keys())
+                    if len(samples) < len(key_counts):
+                        for key, inner in item.items():
+                            samples.setdefault(key, inner)
                 merged_fields: dict[str, Any] = {}
                 for key in sorted(key_counts):
-                    samples = [item.get(key) for item in value if key in item]
-                    sample_value = samples[0] if samples else None
-                    merged_fields[key] = infer_schema(sample_value, depth - 1, include_counts)
+                    merged_fields[key] = infer_schema(samples[key], depth - 1, include_counts)
                     if include_counts:
                         merged_fields[key]["presence"] = f"{key_counts[key]}/{len(value)}"
                 out["item_schema"] = {"type": "object", "fields": merged_fields}
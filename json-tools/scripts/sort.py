@@ -9,7 +9,7 @@ from __future__ import annotations
 import argparse
 from typing import Any
 
-from common import first_value, load_json, resolve_array, write_json
+from common import first_values, load_json, resolve_array, write_json_array
 
 
 def parse_fields(raw: str) -> list[str]:
@@ -27,8 +27,13 @@ def normalize(value: Any, numeric: bool) -> Any:
     return str(value)
 
 
-def key_for_record(record: Any, fields: list[str], numeric: bool) -> tuple[Any, ...]:
-    return tuple(normalize(first_value(record, field), numeric) for field in fields)
+def sort_keys(rows: list[Any], fields: list[str], numeric: bool) -> list[Any]:
+    """Per-row sort keys, built one field column at a time rather than one record at a time."""
+    columns = [[normalize(value, numeric) for value in first_values(rows, field)] for field in fields]
+    if len(columns) == 1:
+        # A lone field sorts by its values directly; they order exactly as their 1-tuples would.
+        return columns[0]
+    return list(zip(*columns))
 
 
 def main() -> None:
@@ -47,8 +52,9 @@ def main() -> None:
     if not rows:
         rows = data if isinstance(data, list) else [data]
 
-    sorted_rows = sorted(rows, key=lambda row: key_for_record(row, fields, args.numeric), reverse=args.desc)
-    write_json(sorted_rows, compact=args.compact)
+    keys = sort_keys(rows, fields, args.numeric)
+    order = sorted(range(len(rows)), key=keys.__getitem__, reverse=args.desc)
+    write_json_array(map(rows.__getitem__, order), compact=args.compact)
 
 
 if __name__ == "__main__":
@@ -11,7 +11,18 @@ import math
 from collections import Counter, defaultdict
 from typing import Any
 
-from common import extract_values, frequency, load_json, resolve_array, type_name, unique_types, write_json
+from common import (
+    NUMERIC_TYPES,
+    frequency,
+    iter_ndjson,
+    load_json,
+    parse_path,
+    resolve_array,
+    type_name,
+    unique_types,
+    values_getter,
+    write_json,
+)
 
 
 def parse_fields(raw: str | None) -> list[str]:
@@ -21,7 +32,7 @@ def parse_fields(raw: str | None) -> list[str]:
 
 
 def numeric_summary(values: list[Any]) -> dict[str, Any]:
-    nums = [float(v) for v in values if isinstance(v, (int, float)) and not isinstance(v, bool)]
+    nums = [float(v) for v in values if type(v) in NUMERIC_TYPES]
     if not nums:
         return {}
     return {
@@ -38,13 +49,19 @@ def main() -> None:
     parser.add_argument("--array-path", help="Path to the array to analyze.")
     parser.add_argument("--fields", help="Comma-separated field paths to analyze.")
     parser.add_argument("--top", type=int, default=10, help="Top N frequent values to include.")
+    parser.add_argument("--ndjson", action="store_true", help="Input is newline-delimited JSON (one record per line); --array-path is not used.")
     parser.add_argument("--compact", action="store_true", help="Emit compact JSON output.")
     args = parser.parse_args()
 
-    data = load_json(args.input)
-    records = resolve_array(data, args.array_path)
-    if not records:
-        records = data if isinstance(data, list) else [data]
+    records: list[Any]
+    if args.ndjson:
+        # Each line is parsed on its own; the records are kept, since every field makes a pass over them.
+        records = list(iter_ndjson(args.input))
+    else:
+        data = load_json(args.input)
+        records = resolve_array(data, args.array_path)
+        if not records:
+            records = data if isinstance(data, list) else [data]
 
     selected_fields = parse_fields(args.fields)
     if not selected_fields:
@@ -54,15 +71,35 @@ def main() -> None:
                 field_candidates.update(record.keys())
         selected_fields = sorted(field_candidates)
 
+    # Values of top-level keys are collected in one pass over the records' items, however many are
+    # selected; nested and wildcard paths are resolved per field below.
+    top_level: dict[str, list[Any]] = {
+        field: [] for field in selected_fields if field != "*" and parse_path(field) == [field]
+    }
+    if top_level:
+        for record in records:
+            if isinstance(record, dict):
+                for key, value in record.items():
+                    bucket = top_level.get(key)
+                    if bucket is not None:
+                        bucket.append(value)
+
     field_stats: dict[str, Any] = {}
     for field in selected_fields:
-        values: list[Any] = []
-        presence = 0
-        for record in records:
-            found = extract_values(record, field)
-            if found:
-                presence += 1
-                values.extend(found)
+        values: list[Any]
+        if field in top_level:
+            # A record holds a key at most once, so each collected value is one present record.
+            values = top_level[field]
+            presence = len(values)
+        else:
+            values = []
+            presence = 0
+            values_of = values_getter(field)
+            for record in records:
+                found = values_of(record)
+                if found:
+                    presence += 1
+                    values.extend(found)
         freq = frequency(values)
         has_complex = any(isinstance(v, (dict, list)) for v in values)
         entry: dict[str, Any] = {
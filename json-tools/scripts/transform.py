@@ -11,46 +11,83 @@ import csv
 import io
 import json
 import sys
-from typing import Any
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Iterable, Iterator, Sequence
 
-from common import flatten_json, load_json, resolve_array, write_json
+from common import JSON_ARRAY_BATCH_ITEMS, WRITE_BATCH_ROWS, flatten_json, load_json, resolve_array, write_json, write_json_array
 
 
-def parse_columns(raw: str | None) -> list[str]:
+@lru_cache(maxsize=64)
+def parse_columns(raw: str | None) -> tuple[str, ...]:
+    # Cached, so the result is a tuple that callers cannot alter.
     if not raw:
-        return []
-    return [item.strip() for item in raw.split(",") if item.strip()]
+        return ()
+    return tuple(item.strip() for item in raw.split(",") if item.strip())
 
 
-def json_to_csv(data: Any, columns: list[str]) -> str:
+def write_csv(data: Any, columns: Sequence[str]) -> None:
+    """
+    Write rows as CSV with nested values flattened, formatting WRITE_BATCH_ROWS rows in memory per
+    write. Rows are flattened as they are written unless the columns must first be discovered from all.
+    """
     rows = data if isinstance(data, list) else [data]
-    flattened = [flatten_json(row) if isinstance(row, (dict, list)) else {"value": row} for row in rows]
+    flattened: Iterator[dict[str, Any]] = (
+        flatten_json(row) if isinstance(row, (dict, list)) else {"value": row} for row in rows
+    )
     if not columns:
-        column_set: set[str] = set()
-        for row in flattened:
-            column_set.update(row.keys())
-        columns = sorted(column_set)
+        cached = list(flattened)
+        # One C-level union over every row's keys; sorting then only orders the distinct columns.
+        columns = sorted(set().union(*cached))
+        flattened = iter(cached)
     output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=columns, extrasaction="ignore")
-    writer.writeheader()
-    for row in flattened:
-        writer.writerow({col: row.get(col) for col in columns})
-    return output.getvalue()
-
-
-def json_to_jsonl(data: Any) -> str:
+    writer = csv.writer(output)
+    writer.writerow(columns)
+    while True:
+        # Each row is projected onto the columns by mapping its own get() over them, with no per-row
+        # dict or list; missing columns are None, which csv writes as an empty field.
+        writer.writerows(map(row.get, columns) for row in islice(flattened, WRITE_BATCH_ROWS))
+        if not output.tell():
+            break
+        sys.stdout.write(output.getvalue())
+        output.seek(0)
+        output.truncate()
+
+
+def write_jsonl(data: Any) -> None:
+    """Write rows as JSON lines, JSON_ARRAY_BATCH_ITEMS rows per write instead of one string for all."""
     rows = data if isinstance(data, list) else [data]
-    return "\n".join(json.dumps(row, ensure_ascii=False) for row in rows) + "\n"
-
-
-def csv_to_json(path: str | None) -> Any:
-    if not path or path == "-":
-        text = sys.stdin.read()
-    else:
-        with open(path, "r", encoding="utf-8", newline="") as handle:
-            text = handle.read()
-    reader = csv.DictReader(io.StringIO(text))
-    return list(reader)
+    if not rows:
+        sys.stdout.write("\n")
+        return
+    # One encoder for every row; json.dumps with options builds a new encoder per call.
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    for start in range(0, len(rows), JSON_ARRAY_BATCH_ITEMS):
+        lines = list(map(encode, rows[start : start + JSON_ARRAY_BATCH_ITEMS]))
+        lines.append("")
+        sys.stdout.write("\n".join(lines))
+
+
+def csv_records(lines: Iterable[str]) -> Iterator[dict[Any, Any]]:
+    """
+    Yield one record per CSV data row as lines are read: csv.reader plus one dict(zip()) per row,
+    the same records csv.DictReader builds without its per-row Python-level __next__.
+    """
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+    width = len(header)
+    for row in reader:
+        if not row:
+            # DictReader skips blank lines.
+            continue
+        record = dict(zip(header, row))
+        if len(row) > width:
+            record[None] = row[width:]
+        elif len(row) < width:
+            record.update(dict.fromkeys(header[len(row) :]))
+        yield record
 
 
 def main() -> None:
@@ -65,8 +102,12 @@ def main() -> None:
     columns = parse_columns(args.columns)
 
     if args.from_format == "csv":
-        result = csv_to_json(args.input)
-        write_json(result)
+        # Records are encoded and written in batches as they are read, so the file is never held whole.
+        if not args.input or args.input == "-":
+            write_json_array(csv_records(sys.stdin))
+        else:
+            with open(args.input, "r", encoding="utf-8", newline="") as handle:
+                write_json_array(csv_records(handle))
         return
 
     data = load_json(args.input)
@@ -75,9 +116,9 @@ def main() -> None:
         data = extracted if extracted else data
 
     if args.to == "csv":
-        print(json_to_csv(data, columns), end="")
+        write_csv(data, columns)
     elif args.to == "jsonl":
-        print(json_to_jsonl(data), end="")
+        write_jsonl(data)
     else:
         # Default passthrough when no transform is requested.
         write_json(data)
@@ -9,41 +9,60 @@ from __future__ import annotations
 import argparse
 import json
 import re
-import sys
-from pathlib import Path
 from typing import Any
 
-from common import type_name, write_json
+from common import iter_array_items, read_input, type_name, write_json
 
-TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+TRAILING_COMMA_RE = re.compile(r",\s*[}\]]")
 
 
-def read_text(path: str | None) -> str:
-    if not path or path == "-":
-        return sys.stdin.read()
-    return Path(path).read_text(encoding="utf-8")
+def decode_error(err: json.JSONDecodeError, warnings: list[str]) -> dict[str, Any]:
+    """Report for input that json could not decode."""
+    return {
+        "valid": False,
+        "error": err.msg,
+        "line": err.lineno,
+        "column": err.colno,
+        "position": err.pos,
+        "warnings": warnings,
+    }
 
 
-def analyze(text: str, strict: bool) -> dict[str, Any]:
+def analyze(text: str, strict: bool, size_bytes: int, summary_only: bool = False) -> dict[str, Any]:
     warnings: list[str] = []
     if strict and TRAILING_COMMA_RE.search(text):
         warnings.append("Possible trailing comma detected.")
+    # A top-level array (the usual large document) is checked one item at a time, never holding the
+    # whole tree, and its errors are reported as found; anything else, or an array whose error only
+    # json.loads can describe, is parsed whole by json.loads.
+    record_count: int | None
     try:
-        parsed = json.loads(text)
+        record_count = sum(1 for _ in iter_array_items(text))
     except json.JSONDecodeError as err:
+        return decode_error(err, warnings)
+    except ValueError:
+        record_count = None
+    if record_count is not None:
+        if summary_only:
+            return {"valid": True, "warnings": warnings}
         return {
-            "valid": False,
-            "error": err.msg,
-            "line": err.lineno,
-            "column": err.colno,
-            "position": err.pos,
+            "valid": True,
+            "top_level_type": "array",
+            "size_bytes": size_bytes,
             "warnings": warnings,
+            "record_count": record_count,
         }
+    try:
+        parsed = json.loads(text)
+    except json.JSONDecodeError as err:
+        return decode_error(err, warnings)
 
+    if summary_only:
+        return {"valid": True, "warnings": warnings}
     result: dict[str, Any] = {
         "valid": True,
         "top_level_type": type_name(parsed),
-        "size_bytes": len(text.encode("utf-8")),
+        "size_bytes": size_bytes,
         "warnings": warnings,
     }
     if isinstance(parsed, list):
@@ -57,11 +76,12 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="Validate JSON file syntax.")
     parser.add_argument("input", nargs="?", default="-", help="Input JSON file path or '-' for stdin.")
     parser.add_argument("--strict", action="store_true", help="Enable extra non-fatal checks.")
+    parser.add_argument("--summary-only", action="store_true", help="Report only validity (and warnings); on success skip the type, size, and count details.")
     parser.add_argument("--compact", action="store_true", help="Emit compact JSON output.")
     args = parser.parse_args()
 
-    text = read_text(args.input)
-    result = analyze(text, strict=args.strict)
+    text, size_bytes = read_input(args.input)
+    result = analyze(text, strict=args.strict, size_bytes=size_bytes, summary_only=args.summary_only)
     write_json(result, compact=args.compact)
 
 